@@ -0,0 +1,119 @@
+"""
+Statistical checks of the fast simulation paths against their references.
+
+Each check samples the vectorized code and the reference it replaces on
+small inputs with fixed seeds, prints the discrepancy and fails if it
+exceeds the bound. The run exits 1 if any check fails.
+
+    python benchmarks/check_models.py
+    python benchmarks/check_models.py --only fake_strategies
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'simulations'))
+
+from ghost_sim.entropy_attack import GhostProtocolFast, entropy_task
+from ghost_sim.entropy_model import expected_entropy
+from ghost_sim.frequency_index import FrequencyIndex
+from ghost_sim.legacy import experiment as legacy_shift
+from ghost_sim.legacy import experiment_o as legacy_rejection
+
+
+def total_variation(a, b):
+    """Total variation distance between the empirical distributions of two ID samples."""
+    size = max(a.max(), b.max()) + 1
+    return 0.5 * np.abs(np.bincount(a, minlength=size) / len(a) - np.bincount(b, minlength=size) / len(b)).sum()
+
+# --- Checks: each returns a list of (case, discrepancy, bound) ---
+
+def check_fake_strategies(num_draws=500000, seed=0):
+    """
+    GhostProtocolFast's 'shift' and 'rejection' replacement of a fake that
+    drew the real recipient, against getFakeRecipient from experiment.py and
+    experiment_o.py, on a fixed history. The histories put the real
+    recipient and recipient 1 (the shift rule's fallback) below, near and
+    above the average, so every branch of the legacy rules is taken.
+    """
+    N, real = 20, 15
+    ids = list(range(1, N + 1))
+    results = []
+    for first_count in (20, 21, 400):
+        for real_count in (21, 22, 200):
+            counts = np.full(N + 1, 20)
+            counts[0] = 0
+            counts[1] = first_count
+            counts[real] = real_count
+            # Every recipient appears, so the legacy mean over recipients seen
+            # equals the fast path's mean over all recipients
+            history = FrequencyIndex(np.repeat(np.arange(N + 1), counts).tolist())
+
+            protocol = GhostProtocolFast(N, rng=np.random.default_rng(seed), dense_history=True)
+            protocol.update_history(np.repeat(np.arange(N + 1), counts))
+            legacy_shift.seed_rngs(seed)
+            legacy_rejection.seed_rngs(seed)
+            for strategy, reference in (('shift', lambda: legacy_shift.getFakeRecipient(ids, real, history, real - 1)),
+                                        ('rejection', lambda: legacy_rejection.getFakeRecipient(ids, real, history, real))):
+                protocol.fake_strategy = strategy
+                fast, _ = protocol._replace_collisions(np.full(num_draws, real))
+                legacy = np.array([reference() for _ in range(num_draws)])
+                case = f'{strategy}[recipient1={first_count},real={real_count},mean={counts.sum() / N:.2f}]'
+                results.append((case, total_variation(fast, legacy), 0.01))
+    return results
+
+
+def check_entropy_model(num_sessions=4000, seed=0):
+    """
+    expected_entropy against Monte Carlo sessions of entropy_task at small
+    (H, B), in the sparse regime of run_entropy_experiment (20 messages to
+    1000 recipients): the mean as a z-score of the Monte Carlo mean, the
+    std as a relative error. In dense sessions, where it is meant to be
+    used, the delta-method std must also match the exact one.
+    """
+    results = []
+    for H, B in [(2, 2), (3, 2), (3, 3), (4, 2)]:
+        config = {'H': H, 'B': B, 'msgs_per_session': 20, 'sessions': num_sessions,
+                  'num_recipients': 1000, 'real_recipient': 42}
+        sessions, _ = entropy_task(config, 0, np.random.default_rng(seed))
+        model = expected_entropy(H, B, 20, 1000)
+        standard_error = sessions.std(ddof=1) / np.sqrt(num_sessions)
+        results.append((f'mean_zscore[H={H},B={B}]', abs(model.mean - sessions.mean()) / standard_error, 4.0))
+        results.append((f'std_rel_error[H={H},B={B}]', abs(model.std / sessions.std(ddof=1) - 1), 0.1))
+    for H, B, messages in [(3, 2, 5000), (4, 2, 2000)]:
+        exact = expected_entropy(H, B, messages, 1000, exact_pair_limit=float('inf'))
+        approx = expected_entropy(H, B, messages, 1000, exact_pair_limit=0)
+        results.append((f'approx_std_rel_error[H={H},B={B},messages={messages}]',
+                        abs(approx.std / exact.std - 1), 0.05))
+    return results
+
+
+CHECKS = {
+    'fake_strategies': check_fake_strategies,
+    'entropy_model': check_entropy_model,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', nargs='*', choices=sorted(CHECKS), help='run only these checks')
+    args = parser.parse_args()
+
+    failures = 0
+    for name, check in CHECKS.items():
+        if args.only and name not in args.only:
+            continue
+        for case, discrepancy, bound in check():
+            ok = discrepancy <= bound
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {name}.{case:<60} {discrepancy:.4f} (bound {bound})")
+    if failures:
+        print(f"{failures} check(s) failed.")
+        sys.exit(1)
+    print("All checks passed.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+"""
+Benchmark suite for the simulation hot paths.
+
+Times every hot path across its scaling axes (recipients, H, B, cycles),
+records throughput in packets/s and peak traced memory, and writes the
+results as JSON. With --compare, any case whose throughput falls below the
+stored baseline by more than --tolerance is reported and the run exits 1.
+
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --save-baseline
+
+Baselines are machine-specific; regenerate baseline.json on the machine
+that runs the comparison.
+"""
+import argparse
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'simulations'))
+
+from ghost_sim.economics import Population, User
+from ghost_sim.entropy_attack import GhostProtocolFast
+from ghost_sim.frequency_index import FrequencyIndex
+from ghost_sim.legacy import experiment as legacy_shift
+from ghost_sim.legacy import experiment_o as legacy_rejection
+from ghost_sim.performance import simulate_latency
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# --- Hot paths: each returns the number of packets (or steps) it processed ---
+
+def bench_get_package_route(recipients, H, B, cycles):
+    # getPackageRouteNew -> getHops, with the rejection-loop fake recipient gate
+    ids = list(range(1, recipients + 1))
+    freq = FrequencyIndex()
+    legacy_rejection.seed_rngs(0)
+    packets = 0
+    for _ in range(cycles):
+        tree = legacy_rejection.getPackageRouteNew(ids, H, H, B, 15, True, False, freq)
+        packets += len(tree)
+    return packets
+
+
+@functools.lru_cache(maxsize=None)
+def _history(recipients, cycles):
+    # Built once per case so the timed loop only covers the gate itself
+    return FrequencyIndex(np.random.default_rng(0).integers(1, recipients + 1, size=cycles).tolist())
+
+
+def bench_get_fake_recipient(recipients, cycles):
+    # getFakeRecipient -> aboveAverage over a history of `cycles` packets
+    ids = list(range(1, recipients + 1))
+    freq = _history(recipients, cycles)
+    legacy_shift.seed_rngs(0)
+    calls = 10000
+    for _ in range(calls):
+        legacy_shift.getFakeRecipient(ids, 15, freq)
+    return calls
+
+
+def bench_generate_burst(recipients, H, B, cycles):
+    # generate_burst_fast + update_history
+    protocol = GhostProtocolFast(recipients, rng=np.random.default_rng(0))
+    packets = 0
+    for _ in range(cycles):
+        burst = protocol.generate_burst_fast(42, H, B, has_real_message=True)
+        protocol.update_history(burst)
+        packets += len(burst)
+    return packets
+
+
+def bench_generate_tree_bursts(recipients, H, B, cycles):
+    # generate_tree_bursts (H hops, 1..B children per node) + consume, with
+    # cycles bursts in one batch; comparable to get_package_route
+    protocol = GhostProtocolFast(recipients, rng=np.random.default_rng(0))
+    protocol.update_history(np.arange(1, recipients + 1))
+    bursts = protocol.generate_tree_bursts(42, H, H, B, num_bursts=cycles)
+    protocol.consume(bursts.recipients, bursts.depth, bursts.parent)
+    return len(bursts.recipients)
+
+
+def bench_intersection_rank(recipients, H, B, cycles):
+    # Per-round burst, history update and rank of the real recipient
+    protocol = GhostProtocolFast(recipients, track_ranks=True, rng=np.random.default_rng(0))
+    packets = 0
+    for _ in range(cycles):
+        burst = protocol.generate_burst_fast(100, H, B, has_real_message=True)
+        protocol.update_history(burst)
+        protocol.rank_of(100)
+        packets += len(burst)
+    return packets
+
+
+def bench_latency_monte_carlo(H, cycles):
+    # One trial is one path of H hops
+    simulate_latency(H, cycles, np.random.default_rng(0), 100, 30, 10)
+    return cycles
+
+
+def bench_user_step(cycles):
+    user = User(1, 'Student', initial_balance=100)
+    for _ in range(cycles):
+        user.step()
+    return cycles
+
+
+def bench_population_step(recipients, cycles):
+    # `recipients` users; returns user-minutes simulated
+    population = Population({'Rich': 0.1, 'Student': 0.9}, recipients, np.random.default_rng(0))
+    for _ in range(cycles):
+        population.step()
+    return recipients * cycles
+
+
+CASES = [
+    ('get_package_route', bench_get_package_route, [
+        {'recipients': 100, 'H': 2, 'B': 2, 'cycles': 200},
+        {'recipients': 1000, 'H': 4, 'B': 2, 'cycles': 200},
+        {'recipients': 100, 'H': 4, 'B': 10, 'cycles': 20},
+    ]),
+    ('get_fake_recipient', bench_get_fake_recipient, [
+        {'recipients': 100, 'cycles': 1000},
+        {'recipients': 1000, 'cycles': 1000000},
+    ]),
+    ('generate_burst_fast', bench_generate_burst, [
+        {'recipients': 1000, 'H': 3, 'B': 2, 'cycles': 2000},
+        {'recipients': 1000, 'H': 5, 'B': 4, 'cycles': 200},
+        {'recipients': 100000, 'H': 5, 'B': 3, 'cycles': 200},
+    ]),
+    ('generate_tree_bursts', bench_generate_tree_bursts, [
+        {'recipients': 1000, 'H': 4, 'B': 2, 'cycles': 200},
+        {'recipients': 1000, 'H': 4, 'B': 10, 'cycles': 2000},
+    ]),
+    ('intersection_rank', bench_intersection_rank, [
+        {'recipients': 1000, 'H': 4, 'B': 3, 'cycles': 500},
+        {'recipients': 1000000, 'H': 4, 'B': 3, 'cycles': 500},
+    ]),
+    ('latency_monte_carlo', bench_latency_monte_carlo, [
+        {'H': 3, 'cycles': 1000000},
+        {'H': 6, 'cycles': 1000000},
+    ]),
+    ('user_step', bench_user_step, [
+        {'cycles': 100000},
+    ]),
+    ('population_step', bench_population_step, [
+        {'recipients': 100000, 'cycles': 50},
+    ]),
+]
+
+
+def case_id(name, params):
+    return name + '[' + ','.join(f'{k}={v}' for k, v in sorted(params.items())) + ']'
+
+
+def run_case(fn, params, repeats):
+    # One untimed warm-up builds cached fixtures (e.g. _history) and pays
+    # first-call costs, then best-of-N wall time without tracing, then one
+    # traced run for peak memory
+    fn(**params)
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        packets = fn(**params)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(**params)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'seconds': best, 'packets': packets, 'packets_per_s': packets / best, 'peak_bytes': peak}
+
+
+def run_all(repeats=3, only=None):
+    results = {}
+    for name, fn, grid in CASES:
+        if only and name not in only:
+            continue
+        for params in grid:
+            key = case_id(name, params)
+            results[key] = dict(run_case(fn, params, repeats), name=name, params=params)
+            r = results[key]
+            print(f"{key:<70} {r['packets_per_s']:>14,.0f} pkt/s  {r['peak_bytes'] / 2**20:>8.1f} MiB")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns the list of (case, current, baseline) that regressed, and the
+    cases that have no baseline entry and so were not compared.
+    """
+    regressions = []
+    missing = []
+    for key, r in results.items():
+        if key not in baseline:
+            missing.append(key)
+            continue
+        reference = baseline[key]['packets_per_s']
+        if r['packets_per_s'] < reference * (1 - tolerance):
+            regressions.append((key, r['packets_per_s'], reference))
+    return regressions, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default='bench_output.json', help='where to write the results JSON')
+    parser.add_argument('--compare', metavar='BASELINE', help='fail if slower than this baseline JSON')
+    parser.add_argument('--tolerance', type=float, default=0.35,
+                        help='allowed relative throughput drop before failing (default 0.35)')
+    parser.add_argument('--strict', action='store_true', help='with --compare, also fail on cases with no baseline')
+    parser.add_argument('--save-baseline', action='store_true', help=f'also merge results into {BASELINE_PATH}')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--only', nargs='*', help='run only these benchmark names')
+    args = parser.parse_args()
+
+    results = run_all(args.repeats, args.only)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    if args.save_baseline:
+        # Merge, so a run with --only refreshes just its own cases
+        baseline = {}
+        if os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(baseline, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions, missing = compare(results, baseline, args.tolerance)
+        for key in missing:
+            print(f"WARNING {key}: no baseline entry in {args.compare}, not compared")
+        for key, current, reference in regressions:
+            print(f"REGRESSION {key}: {current:,.0f} pkt/s vs baseline {reference:,.0f} pkt/s "
+                  f"({(1 - current / reference) * 100:.0f}% slower)")
+        if regressions or (missing and args.strict):
+            sys.exit(1)
+        unchecked = f", {len(missing)} case(s) without a baseline" if missing else ""
+        print(f"No regressions against {args.compare} (tolerance {args.tolerance:.0%}{unchecked}).")
+
+
+if __name__ == '__main__':
+    main()
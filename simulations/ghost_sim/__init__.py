@@ -0,0 +1,90 @@
+"""
+G.H.O.S.T. protocol simulations as an importable package.
+
+Names are resolved on first access, so `import ghost_sim` is cheap and
+NumPy or Matplotlib load only when something that needs them is used.
+Experiments can also be run with `python -m ghost_sim <command>`.
+"""
+from importlib import import_module
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    # Burst generation and protocol state
+    'GhostProtocolFast': 'entropy_attack',
+    'FAKE_STRATEGIES': 'entropy_attack',
+    'TreeBursts': 'entropy_attack',
+    'BurstCounts': 'entropy_attack',
+    'RelayLoad': 'entropy_attack',
+    'consume_stream': 'entropy_attack',
+    'row_entropies': 'entropy_attack',
+    'FrequencyIndex': 'frequency_index',
+    'RouteTree': 'route_tree',
+    'generate_route_tree': 'route_tree',
+    'complete_tree_chunks': 'route_tree',
+    'random_forest': 'route_tree',
+    'RankTracker': 'rank_tracker',
+    'TrafficModel': 'traffic',
+    'SparseCounts': 'sparse_counts',
+    'DisclosureAttack': 'disclosure',
+    # Models
+    'expected_entropy': 'entropy_model',
+    'simulate_latency': 'performance',
+    'tree_latency': 'performance',
+    'BurstLatency': 'performance',
+    'round_relay_load': 'performance',
+    'simulate_network': 'queue_sim',
+    'QueueStats': 'queue_sim',
+    'RelayEmulator': 'emulator',
+    'EmulatorStats': 'emulator',
+    'Topology': 'topology',
+    'topology_from_spec': 'topology',
+    'User': 'economics',
+    'Population': 'economics',
+    'PROFILES': 'economics',
+    # Experiments
+    'run_entropy_experiment': 'entropy_attack',
+    'run_large_burst_experiment': 'entropy_attack',
+    'run_intersection_experiment': 'entropy_attack',
+    'run_latency_experiment': 'performance',
+    'run_tree_latency_experiment': 'performance',
+    'run_saturation_experiment': 'performance',
+    'run_saturation_simulation': 'performance',
+    'run_relay_load_experiment': 'performance',
+    'run_emulator_experiment': 'emulator',
+    'run_economics_experiment': 'economics',
+    'run_population_experiment': 'economics',
+    'run_traffic_experiment': 'traffic',
+    'run_disclosure_experiment': 'disclosure',
+    'generate_overhead_plot': 'overhead',
+    # Infrastructure
+    'run_sweep': 'sweep',
+    'task_seed': 'sweep',
+    'run_adaptive': 'adaptive',
+    'QuantileSketch': 'quantile_sketch',
+    'ResultsStore': 'results_store',
+    'new_store': 'results_store',
+    'ResultCache': 'result_cache',
+    'Instrumentation': 'instrumentation',
+    'set_figures_dir': 'figures',
+}
+
+_SUBMODULES = {'adaptive', 'cli', 'disclosure', 'economics', 'emulator', 'entropy_attack', 'entropy_model',
+               'figures', 'frequency_index', 'instrumentation', 'legacy', 'overhead', 'performance',
+               'quantile_sketch', 'queue_sim', 'rank_tracker', 'result_cache', 'results_store',
+               'route_tree', 'sparse_counts', 'sweep', 'topology', 'traffic'}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return import_module(f'.{name}', __name__)
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f'.{_EXPORTS[name]}', __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | _SUBMODULES)
@@ -0,0 +1,5 @@
+from .cli import main
+
+# Guarded, as process pools may re-import this module in their workers
+if __name__ == "__main__":
+    main()
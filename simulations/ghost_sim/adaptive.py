@@ -0,0 +1,100 @@
+import math
+from collections import namedtuple
+from statistics import NormalDist
+
+import numpy as np
+
+from .sweep import run_sweep
+
+# Per-config outcome of run_adaptive: the task results in trial order, the
+# final estimate and its achieved relative error
+AdaptiveResult = namedtuple('AdaptiveResult', ['trials', 'estimate', 'rel_error'])
+
+
+def _z(confidence):
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def mean_interval(samples, confidence=0.95):
+    """
+    (mean, half-width of its normal confidence interval) along axis 0, so a
+    (trials, rounds) matrix gives one interval per round.
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    n = len(samples)
+    mean = samples.mean(axis=0)
+    if n < 2:
+        return mean, np.full(np.shape(mean), np.inf)[()]
+    return mean, _z(confidence) * samples.std(axis=0, ddof=1) / math.sqrt(n)
+
+
+def quantile_interval(sketch, q, confidence=0.95):
+    """
+    (quantile, half-width of its confidence interval) from a QuantileSketch.
+
+    The interval comes from order statistics: the sample rank of the q
+    quantile is Binomial(n, q), so the bounds are the sketch quantiles at
+    q +/- z * sqrt(q (1 - q) / n). The half-width is floored at the sketch's
+    own relative accuracy, which no amount of sampling can beat.
+    """
+    n = sketch.count
+    spread = _z(confidence) * math.sqrt(q * (1 - q) / n)
+    low, estimate, high = sketch.quantile([max(0.0, q - spread), q, min(1.0, q + spread)])
+    half_width = max((high - low) / 2, sketch.relative_accuracy * abs(estimate))
+    return estimate, half_width
+
+
+def relative_error(estimate, half_width):
+    """Largest half_width / |estimate| over all entries (0 for exact zeros)."""
+    estimate = np.abs(np.asarray(estimate, dtype=np.float64))
+    half_width = np.asarray(half_width, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(half_width == 0, 0.0, half_width / estimate)
+    return float(np.max(ratio))
+
+
+def run_adaptive(task_fn, configs, estimate_fn, min_trials, rel_error=None, max_trials=None,
+                 master_seed=0, workers=None, cache=None, metrics=None):
+    """
+    Runs sweep tasks for each config until its estimate is precise enough.
+
+    estimate_fn(task results) returns (estimate, half-width) for one config;
+    the estimate may be an array, whose worst entry then decides. Each
+    config first runs min_trials tasks; while the relative error is above
+    rel_error and fewer than max_trials have run, it runs as many more as
+    the error predicts are needed (error shrinks as 1 / sqrt(trials)), at
+    least min_trials at a time. With rel_error=None exactly min_trials run,
+    as a fixed-count sweep would. Each round is one run_sweep over every
+    config still short of its target, so they share one process pool.
+    Trials keep their index across rounds, so results match a single sweep
+    of the same total size and are cached.
+    Returns one AdaptiveResult per config.
+    """
+    if max_trials is None:
+        max_trials = min_trials
+
+    trials = [[] for _ in configs]
+    results = [None] * len(configs)
+    batches = [min_trials] * len(configs)
+    active = list(range(len(configs)))
+    while active:
+        new_trials = run_sweep(task_fn, [configs[i] for i in active], [batches[i] for i in active],
+                               master_seed=master_seed, workers=workers, cache=cache, metrics=metrics,
+                               first_trial=[len(trials[i]) for i in active])
+        still_active = []
+        for i, batch_results in zip(active, new_trials):
+            trials[i] += batch_results
+            estimate, half_width = estimate_fn(trials[i])
+            error = relative_error(estimate, half_width)
+            results[i] = AdaptiveResult(trials[i], estimate, error)
+            if rel_error is None or error <= rel_error or len(trials[i]) >= max_trials:
+                continue
+            if math.isinf(error):
+                needed = 2 * len(trials[i])
+            else:
+                # 10% headroom, so the next round usually suffices
+                needed = math.ceil(len(trials[i]) * (error / rel_error) ** 2 * 1.1)
+            batches[i] = min(max_trials - len(trials[i]), max(needed - len(trials[i]), min_trials))
+            still_active.append(i)
+        active = still_active
+    return results
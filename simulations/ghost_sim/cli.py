@@ -0,0 +1,167 @@
+"""
+Run the G.H.O.S.T. simulations: python -m ghost_sim <command> [options]
+
+Each command imports only the module it runs, and Matplotlib is imported
+only when a figure is drawn, with the non-interactive Agg backend. CSVs go
+to results/ and figures to --figures-dir, so run from the repository root
+with simulations/ on the path:
+
+    PYTHONPATH=simulations python -m ghost_sim entropy --workers 4
+"""
+import argparse
+import time
+from importlib import import_module
+
+# name -> (module, function, help, options passed through as keyword arguments)
+COMMANDS = {
+    'entropy': ('entropy_attack', 'run_entropy_experiment',
+                'Experiment B: Shannon entropy per (H, B)',
+                ('seed', 'workers', 'use_cache', 'metrics', 'rel_error')),
+    'large-bursts': ('entropy_attack', 'run_large_burst_experiment',
+                     'Experiment B2: streamed bursts up to H=8, B=11',
+                     ('seed', 'workers', 'use_cache', 'metrics')),
+    'intersection': ('entropy_attack', 'run_intersection_experiment',
+                     'Experiment A: intersection attack resilience',
+                     ('seed', 'workers', 'use_cache', 'metrics', 'rel_error', 'fake_strategy')),
+    'latency': ('performance', 'run_latency_experiment',
+                'Experiment C: latency vs. entropy',
+                ('seed', 'workers', 'use_cache', 'rel_error', 'topology_nodes')),
+    'tree-latency': ('performance', 'run_tree_latency_experiment',
+                     'Experiment C2: real-message, decoy and makespan latency over burst trees',
+                     ('seed', 'workers', 'use_cache', 'num_bursts', 'topology_nodes')),
+    'saturation': ('performance', 'run_saturation_experiment',
+                   'Experiment D: average-load saturation model', ()),
+    'saturation-sim': ('performance', 'run_saturation_simulation',
+                       'Experiment D: saturation with explicit relay queues', ('seed', 'topology_nodes')),
+    'relay-load': ('performance', 'run_relay_load_experiment',
+                   'Experiment D2: per-relay load percentiles and hot spots from simulated traffic',
+                   ('seed', 'num_relays', 'duration_s', 'msg_rate')),
+    'emulator': ('emulator', 'run_emulator_experiment',
+                 'Experiment D3: asyncio relays forwarding 1 KB packets over queues or loopback TCP',
+                 ('seed', 'num_nodes', 'num_bursts', 'transport')),
+    'economics': ('economics', 'run_economics_experiment',
+                  'Experiment E: two-user token economy', ()),
+    'population': ('economics', 'run_population_experiment',
+                   'Experiment E: token economy of a whole population',
+                   ('seed', 'num_users', 'num_days', 'earnings')),
+    'traffic': ('traffic', 'run_traffic_experiment',
+                'Experiment F: many senders, sparse adversary observations',
+                ('seed', 'num_senders', 'num_recipients', 'num_rounds', 'metrics')),
+    'disclosure': ('disclosure', 'run_disclosure_experiment',
+                   'Experiment G: statistical disclosure and Bayesian attacks',
+                   ('seed', 'num_senders', 'num_recipients', 'num_rounds')),
+    'overhead': ('overhead', 'generate_overhead_plot',
+                 'Overhead (packets per message) vs. H and B', ()),
+}
+
+# Options whose default is left to the experiment when not given
+EXPERIMENT_DEFAULTS = ('num_senders', 'num_recipients', 'num_rounds', 'num_bursts', 'num_relays', 'duration_s',
+                       'msg_rate', 'num_nodes')
+
+# Modules whose main() makes up the full paper run, in order
+ALL_MODULES = ('entropy_attack', 'performance', 'economics', 'overhead')
+
+LEGACY_SCRIPTS = ('experiment', 'experiment_w_c', 'experiment_o')
+
+
+def _add_option(parser, option):
+    if option == 'seed':
+        parser.add_argument('--seed', type=int, default=0, help='master random seed (default 0)')
+    elif option == 'workers':
+        parser.add_argument('--workers', type=int, default=None,
+                            help='worker processes (default: all cores; 1 runs in-process)')
+    elif option == 'use_cache':
+        parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                            help='recompute instead of reading results/cache')
+    elif option == 'metrics':
+        parser.add_argument('--metrics', metavar='PATH',
+                            help='write instrumentation to PATH (.prom/.txt: Prometheus text, else JSON)')
+        parser.add_argument('--trace-memory', action='store_true',
+                            help='with --metrics, also record peak traced Python allocations (slower)')
+    elif option == 'rel_error':
+        parser.add_argument('--rel-error', type=float, default=None,
+                            help='sample adaptively until this relative error (default: fixed counts)')
+    elif option == 'fake_strategy':
+        parser.add_argument('--fake-strategy', choices=('resample', 'shift', 'rejection'), default='resample',
+                            help='how fakes that hit the real recipient are replaced (default: resample)')
+    elif option == 'topology_nodes':
+        parser.add_argument('--topology-nodes', dest='topology_nodes', type=int, default=None,
+                            help='time hops on a synthetic topology of this many nodes (default: global constants)')
+    elif option == 'num_users':
+        parser.add_argument('--users', dest='num_users', type=int, default=10**6)
+    elif option == 'num_days':
+        parser.add_argument('--days', dest='num_days', type=int, default=30)
+    elif option == 'earnings':
+        parser.add_argument('--earnings', choices=('random', 'routed'), default='random')
+    elif option == 'num_bursts':
+        parser.add_argument('--bursts', dest='num_bursts', type=int)
+    elif option == 'num_senders':
+        parser.add_argument('--senders', dest='num_senders', type=int)
+    elif option == 'num_recipients':
+        parser.add_argument('--recipients', dest='num_recipients', type=int)
+    elif option == 'num_rounds':
+        parser.add_argument('--rounds', dest='num_rounds', type=int)
+    elif option == 'num_relays':
+        parser.add_argument('--relays', dest='num_relays', type=int)
+    elif option == 'duration_s':
+        parser.add_argument('--duration', dest='duration_s', type=int, help='simulated seconds')
+    elif option == 'num_nodes':
+        parser.add_argument('--nodes', dest='num_nodes', type=int)
+    elif option == 'transport':
+        parser.add_argument('--transport', choices=('queue', 'tcp'), default='queue',
+                            help='asyncio queues or loopback TCP sockets between relays (default: queue)')
+    elif option == 'msg_rate':
+        parser.add_argument('--msg-rate', dest='msg_rate', type=float, help='messages per user per second')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='ghost_sim', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--figures-dir', metavar='DIR',
+                        help="where figures are saved (default: $GHOST_FIGURES_DIR or 'Private Messenger/figures')")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name, (_, _, help_text, options) in COMMANDS.items():
+        command = subparsers.add_parser(name, help=help_text)
+        for option in options:
+            _add_option(command, option)
+
+    subparsers.add_parser('all', help='run every paper experiment with its default settings')
+
+    legacy = subparsers.add_parser('legacy', help='run one of the original route-generation scripts')
+    legacy.add_argument('script', choices=LEGACY_SCRIPTS)
+    legacy.add_argument('--show', action='store_true', help='also open the histogram window')
+    legacy.add_argument('--seed', type=int, default=None, help='random seed (default: the wall clock)')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.figures_dir:
+        from .figures import set_figures_dir
+        set_figures_dir(args.figures_dir)
+
+    start = time.perf_counter()
+    if args.command == 'all':
+        for module in ALL_MODULES:
+            import_module(f'.{module}', __package__).main()
+    elif args.command == 'legacy':
+        import_module(f'.legacy.{args.script}', __package__).main(show=args.show, seed=args.seed)
+    else:
+        module, function, _, options = COMMANDS[args.command]
+        kwargs = {option: getattr(args, option) for option in options
+                  if option not in EXPERIMENT_DEFAULTS or getattr(args, option) is not None}
+
+        metrics_path = kwargs.get('metrics')
+        if metrics_path:
+            from .instrumentation import Instrumentation
+            kwargs['metrics'] = Instrumentation(trace_memory=args.trace_memory)
+
+        getattr(import_module(f'.{module}', __package__), function)(**kwargs)
+
+        if metrics_path:
+            kwargs['metrics'].dump(metrics_path)
+            print(f"Metrics written to {metrics_path}")
+
+    print(f"Done in {time.perf_counter() - start:.1f}s.")
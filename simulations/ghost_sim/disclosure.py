@@ -0,0 +1,230 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .figures import figure_path, pyplot
+from .results_store import new_store
+from .sparse_counts import SparseCounts
+from .traffic import TrafficModel
+
+# --- Statistical Disclosure and Bayesian Attacks ---
+
+# Per target pair: expected rank of the true recipient under each attack, and
+# the Bayesian posterior probability that the sender's next message goes to it
+AttackResult = namedtuple('AttackResult', ['sda_rank', 'bayes_rank', 'posterior'])
+
+
+class DisclosureAttack:
+    """
+    Statistical disclosure (SDA) and Bayesian attacks on many targets at
+    once, updated incrementally from the rounds of a TrafficModel.
+
+    The adversary sees every burst and who sent it. Per target sender it
+    keeps the packets seen in that sender's bursts (`observed`), and over
+    all traffic the packet count per recipient (`background`). A burst of K
+    packets carries one real message and K - 1 packets that look like
+    background, so the SDA score of recipient r for target t is
+
+        observed[t, r] - bursts[t] * (K - 1) * background[r] / total
+
+    the observed count minus its expected background share. Scores are
+    compared multiplied by total, in integers, so ties are exact.
+
+    The Bayesian attack gives each packet of a target's burst the posterior
+    probability of being the real one, proportional to 1 / u(r) with u the
+    background distribution before that round (add-one smoothed). Summed
+    over bursts this is the expected number of real messages per recipient,
+    `expected[t, r]`, and under a symmetric Dirichlet(prior) over the
+    sender's contacts, recipient r has posterior probability
+    (prior + expected[t, r]) / (N * prior + bursts[t]). The default prior
+    of 1 / N puts one message's worth of weight on the uniform guess.
+
+    A round only adds the targets' new bursts and one bincount-sized update
+    to the background; nothing is recomputed from history. Targets are
+    (sender, true recipient) pairs, so a sender with several contacts
+    appears once per contact.
+    """
+
+    def __init__(self, num_senders, num_recipients, burst_size, target_senders, true_recipients,
+                 prior=None):
+        self.num_recipients = num_recipients
+        self.burst_size = burst_size
+        # Total prior mass of one message, spread evenly by default
+        self.prior = prior if prior is not None else 1 / num_recipients
+        self.target_senders = np.asarray(target_senders, dtype=np.int64)
+        self.true_recipients = np.asarray(true_recipients, dtype=np.int64)
+
+        # Row of each target sender in the per-target matrices, -1 for the rest
+        senders = np.unique(self.target_senders)
+        self._row_of = np.full(num_senders, -1, dtype=np.int64)
+        self._row_of[senders] = np.arange(len(senders))
+        self.pair_rows = self._row_of[self.target_senders]
+
+        self.bursts = np.zeros(len(senders), dtype=np.int64)
+        self.observed = SparseCounts(len(senders), num_recipients + 1)
+        self.expected = SparseCounts(len(senders), num_recipients + 1, dtype=np.float64)
+        self.background = np.zeros(num_recipients + 1, dtype=np.int64)
+        self.total_packets = 0
+
+    def observe(self, senders, bursts):
+        """Adds one round: senders[i] emitted the burst bursts[i]."""
+        rows = self._row_of[senders]
+        mine = rows >= 0
+        if np.any(mine):
+            rows, target_bursts = rows[mine], bursts[mine]
+            np.add.at(self.bursts, rows, 1)
+            self.observed.add(rows[:, None], target_bursts)
+            weights = 1 / (self.background[target_bursts] + 1.0)
+            weights /= weights.sum(axis=1, keepdims=True)
+            self.expected.add(rows[:, None], target_bursts, weights)
+
+        np.add.at(self.background, bursts.ravel(), 1)
+        self.total_packets += bursts.size
+
+    def evaluate(self):
+        """
+        Ranks every target pair's true recipient among all recipients, as an
+        AttackResult. Rank is 1 + the number of recipients scored higher +
+        half the number tied with it (the expected rank when ties are broken
+        at random), since before a target has sent, every score is tied.
+        """
+        N = self.num_recipients
+        rows, true = self.pair_rows, self.true_recipients
+        bursts = self.bursts[rows]
+        background = self.background
+
+        # Both matrices hold the same cells, added together
+        indptr, cols, counts = self.observed.csr()
+        weights = self.expected.csr()[2]
+        owner, positions, row_sizes = _row_cells(indptr, rows)
+        unobserved = N - row_sizes
+
+        # SDA, in units of 1 / total_packets; D is each row's background factor
+        T = self.total_packets
+        row_D = self.bursts * (self.burst_size - 1)
+        D = row_D[rows]
+        cell_rows = np.repeat(np.arange(len(self.bursts)), np.diff(indptr))
+        cell_background = background[cols]
+        score = counts.astype(np.int64) * T - row_D[cell_rows] * cell_background
+        true_score = self.observed.get(rows, true).astype(np.int64) * T - D * background[true]
+
+        cell_score = score[positions]
+        greater = _count(owner, cell_score > true_score[owner], len(rows))
+        tied = _count(owner, cell_score == true_score[owner], len(rows))
+
+        # Unobserved recipients score -D * background[r]; count them from a
+        # histogram of background counts, minus the row's observed cells
+        histogram = np.bincount(background[1:])
+        at_most = np.cumsum(histogram)
+        q = -true_score
+        safe_D = np.maximum(D, 1)
+        limit = -(-q // safe_D)  # Greater iff background[r] < limit
+        below = np.where(limit > 0, at_most[np.clip(limit - 1, 0, len(at_most) - 1)], 0)
+        level = q // safe_D      # Tied iff background[r] == level
+        exact = (q >= 0) & (q % safe_D == 0)
+        at_level = np.where(exact & (level < len(histogram)),
+                            histogram[np.clip(level, 0, len(histogram) - 1)], 0)
+        owned_background = cell_background[positions]
+        below -= _count(owner, owned_background < limit[owner], len(rows))
+        at_level -= _count(owner, exact[owner] & (owned_background == level[owner]), len(rows))
+        # Without bursts (D == 0) every unobserved recipient scores 0
+        below = np.where(D > 0, below, 0)
+        at_level = np.where(D > 0, at_level, np.where(true_score == 0, unobserved, 0))
+        sda_rank = 1 + greater + below + (tied + at_level - 1) / 2
+
+        # Bayesian: unobserved recipients have expected count 0
+        true_expected = self.expected.get(rows, true)
+        cell_weight = weights[positions]
+        greater = _count(owner, cell_weight > true_expected[owner], len(rows))
+        tied = _count(owner, cell_weight == true_expected[owner], len(rows))
+        tied += np.where(true_expected == 0, unobserved, 0)
+        bayes_rank = 1 + greater + (tied - 1) / 2
+        posterior = (self.prior + true_expected) / (N * self.prior + bursts)
+
+        return AttackResult(sda_rank, bayes_rank, posterior)
+
+
+def _row_cells(indptr, rows):
+    """
+    The stored cells of CSR rows[i], for every i at once, as (owner,
+    positions, row sizes) where owner is the index i each cell belongs to.
+    """
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    owner = np.repeat(np.arange(len(rows)), lengths)
+    offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    positions = np.arange(len(owner)) + offsets
+    return owner, positions, lengths
+
+
+def _count(owner, mask, size):
+    """Number of True entries of mask per owner."""
+    return np.bincount(owner[mask], minlength=size)
+
+
+# --- Experiment ---
+
+def run_disclosure_experiment(num_senders=10**4, num_recipients=10**5, num_rounds=200, seed=0,
+                              num_targets=1000):
+    print(f"\nStarting Experiment G: Statistical Disclosure and Bayesian Attacks "
+          f"({num_senders} senders, {num_targets} targets)...")
+
+    configs = [
+        {'H': 3, 'B': 2, 'label': 'Weak (H=3, B=2)'},
+        {'H': 4, 'B': 3, 'label': 'Medium (H=4, B=3)'},
+    ]
+    store = new_store('disclosure', {'H': 'i8', 'B': 'i8', 'Round': 'i8',
+                                     'SDAMeanRank': 'f8', 'SDAMedianRank': 'f8',
+                                     'BayesMeanRank': 'f8', 'BayesMedianRank': 'f8',
+                                     'MeanPosterior': 'f8'})
+
+    plt = pyplot()
+    plt.figure(figsize=(10, 6))
+    x_axis = np.arange(1, num_rounds + 1)
+
+    for config in configs:
+        H, B = config['H'], config['B']
+        traffic = TrafficModel(num_senders, num_recipients, np.random.default_rng(seed), H=H, B=B,
+                               mean_contacts=3, mean_send_prob=0.1, observe=False)
+        # Every contact of the first num_targets senders is a target pair
+        targets = np.arange(min(num_targets, num_senders))
+        pair_senders = np.repeat(targets, traffic.num_contacts[targets])
+        pair_recipients = np.concatenate([traffic.contacts_of(s) for s in targets])
+        attack = DisclosureAttack(num_senders, num_recipients, B ** H, pair_senders, pair_recipients)
+
+        stats = np.empty((num_rounds, 5))
+        for r in range(num_rounds):
+            round_traffic = traffic.step()
+            attack.observe(round_traffic.senders, round_traffic.bursts)
+            result = attack.evaluate()
+            stats[r] = (result.sda_rank.mean(), np.median(result.sda_rank),
+                        result.bayes_rank.mean(), np.median(result.bayes_rank),
+                        result.posterior.mean())
+
+        store.append(H=np.full(num_rounds, H), B=np.full(num_rounds, B), Round=x_axis,
+                     SDAMeanRank=stats[:, 0], SDAMedianRank=stats[:, 1],
+                     BayesMeanRank=stats[:, 2], BayesMedianRank=stats[:, 3],
+                     MeanPosterior=stats[:, 4])
+        print(f"{config['label']}: after {num_rounds} rounds, median rank {stats[-1, 1]:.0f} (SDA), "
+              f"{stats[-1, 3]:.0f} (Bayesian); mean posterior {stats[-1, 4]:.3f}")
+
+        p = plt.plot(x_axis, stats[:, 1], label=f"{config['label']} SDA", linewidth=2)
+        plt.plot(x_axis, stats[:, 3], label=f"{config['label']} Bayesian", linewidth=2,
+                 linestyle='--', color=p[0].get_color())
+
+    plt.xlabel('Rounds')
+    plt.ylabel('Median Rank of Real Recipient (Log Scale)')
+    plt.title('Statistical Disclosure and Bayesian Attacks')
+    plt.legend()
+    plt.grid(True, which="both", ls="-", alpha=0.5)
+    plt.yscale('log')
+    plt.gca().invert_yaxis() # 1 at top
+
+    plt.tight_layout()
+    plt.savefig(figure_path('results_disclosure_attack.png'))
+    store.export_csv('results/results_disclosure.csv')
+    print("Experiment G Complete.")
+
+
+if __name__ == "__main__":
+    run_disclosure_experiment()
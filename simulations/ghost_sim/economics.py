@@ -0,0 +1,323 @@
+import numpy as np
+import random
+
+from .entropy_attack import GhostProtocolFast
+from .figures import figure_path, pyplot
+from .results_store import new_store
+
+# Behaviour per user type
+PROFILES = {
+    # Sends frequently, rarely relays
+    'Rich': {
+        'msg_prob': 0.8, # Probability to send per minute
+        'relay_uptime': 0.1, # 10% chance to be online for relaying
+        'H': 5, 'B': 4, # High cost
+    },
+    # Student/Poor: sends rarely, always relays
+    'Student': {
+        'msg_prob': 0.05,
+        'relay_uptime': 0.95,
+        'H': 3, 'B': 2, # Low cost
+    },
+}
+
+class User:
+    def __init__(self, uid, user_type, initial_balance=1000):
+        self.uid = uid
+        self.type = user_type
+        self.balance = initial_balance
+        self.balance_history = [initial_balance]
+        
+        # Configure behavior based on type
+        profile = PROFILES['Rich'] if user_type == 'Rich' else PROFILES['Student']
+        self.msg_prob = profile['msg_prob']
+        self.relay_uptime = profile['relay_uptime']
+        self.privacy_pref = {'H': profile['H'], 'B': profile['B']}
+
+    def step(self):
+        # 1. Spending (Sending)
+        spent = 0
+        if random.random() < self.msg_prob:
+            # Calculate Cost: Cost = Total Packets Generated
+            # Because you pay for the burden you put on network
+            h = self.privacy_pref['H']
+            b = self.privacy_pref['B']
+            cost = b ** h
+            
+            # Can I afford it?
+            if self.balance >= cost:
+                self.balance -= cost
+                spent = cost
+        
+        # 2. Earning (Relaying)
+        # Simplified: If I am online, I might get picked to relay.
+        # Probability depends on network demand.
+        earned = 0
+        if random.random() < self.relay_uptime:
+            # Assume constant network background noise
+            # I get picked X times per minute.
+            # Let's say average relay load is 10 packets/min
+            msgs_relayed = random.randint(5, 20)
+            reward_per_msg = 1
+            earned = msgs_relayed * reward_per_msg
+            self.balance += earned
+            
+        self.balance_history.append(self.balance)
+        return spent, earned
+
+class Population:
+    """
+    Struct-of-arrays population for the economics simulation.
+
+    Each attribute of User is one NumPy array over all users, so a simulated
+    minute is a handful of array operations however many users there are.
+    `mix` maps profile names from PROFILES to population shares, e.g.
+    {'Rich': 0.1, 'Student': 0.9}; `initial_balances` optionally maps
+    profile names to starting balances. Users are laid out profile by
+    profile, and the same rules as User.step apply.
+
+    With earnings='routed', relay income is not randint(5, 20): every paid
+    message becomes a real burst from GhostProtocolFast (recipient IDs
+    1..num_users are the users) and each online relay earns one token per
+    packet it is picked for, credited once per minute with bincount. The
+    packet that delivers the real message is not relayed and earns nothing.
+    History is updated after every batch of bursts, as after every burst in
+    the single-burst path, so the above-average gate applies.
+    """
+
+    def __init__(self, mix, num_users, rng, initial_balances=None, initial_balance=1000,
+                 earnings='random', protocol=None, max_batch_packets=1 << 22):
+        self.rng = rng
+        self.earnings = earnings
+        if earnings == 'routed' and protocol is None:
+            protocol = GhostProtocolFast(num_users, rng=rng, dense_history=True)
+        self.protocol = protocol
+        self.max_batch_packets = max_batch_packets
+        self.profile_names = list(mix)
+        shares = np.array([mix[name] for name in self.profile_names], dtype=np.float64)
+        sizes = np.floor(shares / shares.sum() * num_users).astype(np.int64)
+        sizes[-1] = num_users - sizes[:-1].sum()
+        self.num_users = num_users
+
+        # Profile index per user, then one array per attribute
+        self.profile = np.repeat(np.arange(len(sizes), dtype=np.int8), sizes)
+        table = [PROFILES[name] for name in self.profile_names]
+        self.msg_prob = np.array([p['msg_prob'] for p in table], dtype=np.float32)[self.profile]
+        self.relay_uptime = np.array([p['relay_uptime'] for p in table], dtype=np.float32)[self.profile]
+        self.H = np.array([p['H'] for p in table], dtype=np.int8)[self.profile]
+        self.B = np.array([p['B'] for p in table], dtype=np.int8)[self.profile]
+        # Cost = Total Packets Generated (b ** h)
+        self.cost = np.array([p['B'] ** p['H'] for p in table], dtype=np.int64)[self.profile]
+
+        initial_balances = initial_balances or {}
+        balances = [initial_balances.get(name, initial_balance) for name in self.profile_names]
+        self.balance = np.array(balances, dtype=np.int64)[self.profile]
+
+        self.profile_sizes = sizes
+        # Users of one profile are contiguous, so per-profile sums are slices
+        bounds = np.concatenate([[0], np.cumsum(sizes)])
+        self.profile_slices = [slice(int(lo), int(hi)) for lo, hi in zip(bounds[:-1], bounds[1:])]
+        self.profile_cost = np.array([p['B'] ** p['H'] for p in table], dtype=np.int64)
+        # Reusable per-minute buffers
+        self._draw = np.empty(num_users, dtype=np.float32)
+        self._mask = np.empty(num_users, dtype=bool)
+        self._earned = np.empty(num_users, dtype=np.float64)
+
+    def step(self):
+        """
+        Advances every user by one minute. Returns (total spent, total earned).
+        """
+        # 1. Spending (Sending): send with msg_prob if the balance covers b ** h
+        self.rng.random(dtype=np.float32, out=self._draw)
+        np.less(self._draw, self.msg_prob, out=self._mask)
+        self._mask &= self.balance >= self.cost
+        spent = sum(int(cost) * np.count_nonzero(self._mask[users])
+                    for cost, users in zip(self.profile_cost, self.profile_slices))
+        np.subtract(self.balance, self.cost, out=self.balance, where=self._mask)
+
+        if self.earnings == 'routed':
+            return spent, self._earn_routed(self._mask)
+
+        # 2. Earning (Relaying): if online, relay randint(5, 20) packets at 1 token each.
+        # One draw serves both: given draw < uptime, draw / uptime is uniform on [0, 1).
+        self.rng.random(dtype=np.float32, out=self._draw)
+        np.less(self._draw, self.relay_uptime, out=self._mask)
+        # In float64: float32 rounds draws just below uptime up to 21
+        np.divide(self._draw, self.relay_uptime, out=self._earned, dtype=np.float64)
+        self._earned *= 16
+        self._earned += 5
+        np.floor(self._earned, out=self._earned)
+        np.minimum(self._earned, 20, out=self._earned)
+        self._earned *= self._mask
+        earned = int(self._earned.sum(dtype=np.float64))
+        np.add(self.balance, self._earned, out=self.balance, casting='unsafe')
+
+        return spent, earned
+
+    def _earn_routed(self, paid):
+        """
+        Generates the bursts of this minute's paid messages and credits the
+        relays that were picked and online. Returns the tokens earned.
+        """
+        relayed = np.zeros(self.num_users + 1, dtype=np.int64)
+
+        for users in self.profile_slices:
+            senders = np.flatnonzero(paid[users])
+            if len(senders) == 0:
+                continue
+            H = int(self.H[users.start])
+            B = int(self.B[users.start])
+            # Each sender writes to a random contact (IDs are 1..num_users)
+            contacts = self.rng.integers(1, self.num_users + 1, size=len(senders))
+            chunk = max(1, self.max_batch_packets // B ** H)
+            for start in range(0, len(senders), chunk):
+                real = contacts[start:start + chunk]
+                bursts = self.protocol.generate_bursts_batch(real, H, B, len(real)).ravel()
+                self.protocol.update_history(bursts)
+                relayed += np.bincount(bursts, minlength=self.num_users + 1)
+                # Each burst has exactly one real packet, delivered rather than relayed
+                relayed -= np.bincount(real, minlength=self.num_users + 1)
+
+        # Offline relays drop their packets and earn nothing
+        self.rng.random(dtype=np.float32, out=self._draw)
+        online = self._draw < self.relay_uptime
+        earned_per_user = relayed[1:] * online
+        self.balance += earned_per_user
+        return int(earned_per_user.sum())
+
+    def mean_balance(self):
+        """Mean balance per profile, in profile_names order."""
+        return np.array([self.balance[users].mean() for users in self.profile_slices])
+
+    def broke_fraction(self):
+        """Share of each profile that cannot afford its next message."""
+        return np.array([np.count_nonzero(self.balance[users] < cost) / (users.stop - users.start)
+                         for cost, users in zip(self.profile_cost, self.profile_slices)])
+
+def run_economics_experiment():
+    print("Starting Experiment E: Economic Viability...")
+    
+    num_minutes = 60 * 24 # 24 Hours
+    
+    # Create Population
+    rich_user = User(1, 'Rich', initial_balance=5000)
+    student_user = User(2, 'Student', initial_balance=100)
+    
+    print(f"Simulating {num_minutes} minutes...")
+    
+    for t in range(num_minutes):
+        rich_user.step()
+        student_user.step()
+        
+    # Plotting
+    time_axis = range(num_minutes + 1)
+    
+    plt = pyplot()
+    plt.figure(figsize=(10, 6))
+    plt.plot(time_axis, rich_user.balance_history, label='Rich User (High Spend, Low Relay)', color='red', linewidth=2)
+    plt.plot(time_axis, student_user.balance_history, label='Student User (Low Spend, High Relay)', color='green', linewidth=2)
+    
+    plt.xlabel('Time (Minutes)')
+    plt.ylabel('Token Balance')
+    plt.title('24-Hour Economic Simulation: Sustainability')
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig(figure_path('results_economics.png'))
+    
+    # Analyze Survival
+    rich_final = rich_user.balance_history[-1]
+    student_final = student_user.balance_history[-1]
+    
+    print(f"Rich User Final Balance: {rich_final}")
+    print(f"Student User Final Balance: {student_final}")
+    
+    # Save CSV
+    store = new_store('economics', {'Time': 'i8', 'RichBalance': 'i8', 'StudentBalance': 'i8'})
+    store.append(Time=time_axis, RichBalance=rich_user.balance_history,
+                 StudentBalance=student_user.balance_history)
+    store.export_csv('results/results_economics.csv')
+            
+    print("Experiment E Complete.")
+
+def run_population_experiment(num_users=10**6, num_days=30, seed=0, earnings='random', num_sampled=1000):
+    print(f"\nStarting Experiment E (population, {earnings} earnings): Economic Viability at Scale...")
+    
+    num_minutes = 60 * 24 * num_days
+    
+    # Same profiles and starting balances as the two-user experiment
+    mix = {'Rich': 0.1, 'Student': 0.9}
+    initial_balances = {'Rich': 5000, 'Student': 100}
+    
+    population = Population(mix, num_users, np.random.default_rng(seed), initial_balances, earnings=earnings)
+    names = population.profile_names
+    
+    print(f"Simulating {num_users} users for {num_minutes} minutes...")
+    
+    # Per-minute aggregates per profile (row 0 = initial state), plus the full
+    # balance history of num_sampled users spread evenly over the population
+    columns = {'Time': 'i8'}
+    columns.update({f'{name}MeanBalance': 'f8' for name in names})
+    columns.update({f'{name}BrokeFraction': 'f8' for name in names})
+    columns['SampledBalances'] = ('i8', (num_sampled,))
+    store = new_store(f'economics_population_{earnings}', columns)
+    sampled = np.linspace(0, num_users - 1, num_sampled).astype(np.int64)
+    
+    mean_balance = np.empty((num_minutes + 1, len(names)))
+    broke = np.empty((num_minutes + 1, len(names)))
+    sampled_balances = np.empty((60, num_sampled), dtype=np.int64)
+    
+    def record(t):
+        mean_balance[t] = population.mean_balance()
+        broke[t] = population.broke_fraction()
+        sampled_balances[t % 60] = population.balance[sampled]
+    
+    def flush(t):
+        # Append the rows of the hour ending at minute t
+        first = t - t % 60
+        rows = slice(first, t + 1)
+        block = {'Time': np.arange(first, t + 1), 'SampledBalances': sampled_balances[:t - first + 1]}
+        for i, name in enumerate(names):
+            block[f'{name}MeanBalance'] = mean_balance[rows, i]
+            block[f'{name}BrokeFraction'] = broke[rows, i]
+        store.append(**block)
+    
+    record(0)
+    for t in range(1, num_minutes + 1):
+        if t % 60 == 0:
+            flush(t - 1)
+        population.step()
+        record(t)
+    flush(num_minutes)
+    
+    # Plotting
+    time_axis = np.arange(num_minutes + 1) / 60 / 24
+    
+    plt = pyplot()
+    plt.figure(figsize=(10, 6))
+    for i, name in enumerate(names):
+        plt.plot(time_axis, mean_balance[:, i], label=f'{name} Users (mean)', linewidth=2)
+    
+    plt.xlabel('Time (Days)')
+    plt.ylabel('Mean Token Balance')
+    plt.title(f'{num_days}-Day Economic Simulation: {num_users} Users')
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig(figure_path(f'results_economics_population_{earnings}.png'))
+    
+    for i, name in enumerate(names):
+        print(f"{name} Users Final Mean Balance: {mean_balance[-1, i]:.1f} ({broke[-1, i]*100:.1f}% broke)")
+    
+    # Save CSV (aggregates only; sampled histories stay in the binary store)
+    store.export_csv(f'results/results_economics_population_{earnings}.csv')
+    
+    print("Experiment E (population) Complete.")
+
+def main():
+    run_economics_experiment()
+    run_population_experiment()
+    run_population_experiment(num_users=10**5, earnings='routed')
+
+if __name__ == "__main__":
+    main()
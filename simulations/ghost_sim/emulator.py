@@ -0,0 +1,285 @@
+import asyncio
+import struct
+import time
+
+import numpy as np
+
+from .entropy_attack import GhostProtocolFast
+from .quantile_sketch import QuantileSketch
+from .results_store import new_store
+
+# --- Loopback Relay Emulator ---
+
+PACKET_SIZE = 1024  # Padded packet, as in the saturation models
+# Packet header: forest node the packet is addressed to, send time (ns)
+_HEADER = struct.Struct('!iq')
+
+TRANSPORTS = ('queue', 'tcp')
+
+
+class EmulatorStats:
+    """Counters and sketches collected by RelayEmulator.run."""
+
+    def __init__(self):
+        self.injected = 0           # root packets sent by senders
+        self.forwarded = 0          # packets received and processed by relays
+        self.drops = 0              # packets refused by a full inbox
+        self.seconds = 0.0          # wall time from first injection to drained
+        self.sender_blocked = 0.0   # seconds senders waited for room (backpressure)
+        self.hop_latency = QuantileSketch()  # seconds from send to processing at the next relay
+        self.max_queue_length = 0
+
+    @property
+    def pps(self):
+        return self.forwarded / self.seconds if self.seconds else 0.0
+
+
+class RelayEmulator:
+    """
+    Relays that really move bytes: every node is an asyncio task forwarding
+    PACKET_SIZE-byte packets along the bursts of a TreeBursts (see
+    GhostProtocolFast.generate_tree_bursts), in one process.
+
+    Recipient r is node (r - 1) % num_nodes. A packet names the forest node
+    it is addressed to; the receiving relay looks up that node's children
+    and sends each a new packet, a fresh header followed by a copy of the
+    payload. Per hop, the time from send to processing is recorded, so
+    queueing and scheduling delay are included.
+
+    transport='queue' connects relays by asyncio.Queue inboxes;
+    transport='tcp' gives every relay a loopback TCP listener whose reader
+    fills the inbox, with one connection per destination shared by all
+    senders (3 file descriptors per node). An inbox holds queue_limit
+    packets and a relay's packet arriving at a full inbox is dropped, as in
+    queue_sim. Senders instead wait for room (queue) or for the socket
+    buffer to drain (tcp), so overload shows up as sender blocking plus
+    relay drops, and relays can never deadlock on each other.
+    """
+
+    def __init__(self, num_nodes, bursts, queue_limit=100, transport='queue'):
+        if transport not in TRANSPORTS:
+            raise ValueError(f"transport must be one of {TRANSPORTS}, not {transport!r}")
+        self.num_nodes = num_nodes
+        self.queue_limit = queue_limit
+        self.transport = transport
+
+        # Children of every forest node, CSR-style, as lists for per-packet lookups
+        parent = bursts.parent
+        has_parent = parent >= 0
+        child_counts = np.bincount(parent[has_parent], minlength=len(parent))
+        self._child_ptr = np.concatenate([[0], np.cumsum(child_counts)]).tolist()
+        children = np.flatnonzero(has_parent)
+        self._children = children[np.argsort(parent[has_parent], kind='stable')].tolist()
+        self._node_of = ((bursts.recipients.astype(np.int64) - 1) % num_nodes).tolist()
+
+        # Roots in burst order, sent by one sender task
+        roots = np.flatnonzero(~has_parent)
+        self._roots = roots[np.argsort(bursts.burst[roots], kind='stable')].tolist()
+        self.num_packets = len(parent)
+
+    def run(self, burst_rate=None):
+        """
+        Sends every burst, at burst_rate bursts/s or as fast as the relays
+        accept them, waits until the network is drained and returns
+        EmulatorStats.
+        """
+        return asyncio.run(self._run(burst_rate))
+
+    async def _run(self, burst_rate):
+        self.stats = EmulatorStats()
+        self._latencies = []
+        self._outstanding = 0
+        self._injecting = True
+        self._idle = asyncio.Event()
+        self._inboxes = [asyncio.Queue() for _ in range(self.num_nodes)]
+        # Set whenever a relay takes a packet out of its inbox, for waiting senders
+        self._room = [asyncio.Event() for _ in range(self.num_nodes)]
+        if self.transport == 'tcp':
+            await self._connect()
+
+        relays = [asyncio.create_task(self._relay(node)) for node in range(self.num_nodes)]
+        start = time.perf_counter()
+        await self._inject(burst_rate, start)
+        self._injecting = False
+        if self._outstanding == 0:
+            self._idle.set()
+        await self._idle.wait()
+        self.stats.seconds = time.perf_counter() - start
+
+        for task in relays:
+            task.cancel()
+        await asyncio.gather(*relays, return_exceptions=True)
+        if self.transport == 'tcp':
+            await self._disconnect()
+        self.stats.hop_latency.add(self._latencies)
+        return self.stats
+
+    async def _inject(self, burst_rate, start):
+        stats = self.stats
+        padding = bytes(PACKET_SIZE - _HEADER.size)
+        for i, root in enumerate(self._roots):
+            if burst_rate:
+                wait = start + i / burst_rate - time.perf_counter()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            dst = self._node_of[root]
+            self._outstanding += 1
+            stats.injected += 1
+            t0 = time.perf_counter()
+            if self.transport == 'queue':
+                inbox = self._inboxes[dst]
+                while inbox.qsize() >= self.queue_limit:
+                    await self._room[dst].wait()
+                self._enqueue(dst, _HEADER.pack(root, time.perf_counter_ns()) + padding)
+            else:
+                await self._write(dst, _HEADER.pack(root, time.perf_counter_ns()) + padding)
+            stats.sender_blocked += time.perf_counter() - t0
+
+    async def _relay(self, node):
+        inbox = self._inboxes[node]
+        room = self._room[node] if self.transport == 'queue' else None
+        stats = self.stats
+        latencies = self._latencies
+        children, child_ptr, node_of = self._children, self._child_ptr, self._node_of
+        pack, unpack_from, header_size = _HEADER.pack, _HEADER.unpack_from, _HEADER.size
+        while True:
+            packet = await inbox.get()
+            if room is not None:
+                room.set()
+                room.clear()
+            index, sent_ns = unpack_from(packet)
+            latencies.append((time.perf_counter_ns() - sent_ns) * 1e-9)
+            payload = packet[header_size:]
+            for child in children[child_ptr[index]:child_ptr[index + 1]]:
+                self._outstanding += 1
+                child_packet = pack(child, time.perf_counter_ns()) + payload
+                if self.transport == 'queue':
+                    self._enqueue(node_of[child], child_packet)
+                else:
+                    await self._write(node_of[child], child_packet)
+            stats.forwarded += 1
+            self._done()
+            if len(latencies) >= 1 << 16:
+                stats.hop_latency.add(latencies)
+                latencies.clear()
+
+    def _enqueue(self, dst, packet):
+        """Puts packet into dst's inbox, or drops it if the inbox is full."""
+        inbox = self._inboxes[dst]
+        if inbox.qsize() >= self.queue_limit:
+            self.stats.drops += 1
+            self._done()
+            return
+        inbox.put_nowait(packet)
+        if inbox.qsize() > self.stats.max_queue_length:
+            self.stats.max_queue_length = inbox.qsize()
+
+    def _done(self):
+        self._outstanding -= 1
+        if self._outstanding == 0 and not self._injecting:
+            self._idle.set()
+
+    # --- TCP transport ---
+
+    async def _connect(self):
+        self._servers = []
+        self._writers = []
+        self._locks = []
+        self._readers = set()
+        for node in range(self.num_nodes):
+            server = await asyncio.start_server(
+                lambda reader, writer, node=node: self._receive(node, reader, writer), '127.0.0.1', 0)
+            self._servers.append(server)
+        for server in self._servers:
+            _, writer = await asyncio.open_connection('127.0.0.1', server.sockets[0].getsockname()[1])
+            self._writers.append(writer)
+            # drain() is only safe to await from several tasks at once from Python 3.12
+            self._locks.append(asyncio.Lock())
+
+    async def _receive(self, node, reader, writer):
+        self._readers.add(asyncio.current_task())
+        try:
+            while True:
+                self._enqueue(node, await reader.readexactly(PACKET_SIZE))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _write(self, dst, packet):
+        writer = self._writers[dst]
+        writer.write(packet)
+        async with self._locks[dst]:
+            await writer.drain()
+
+    async def _disconnect(self):
+        # Readers stop at end of stream once their connection is closed
+        for writer in self._writers:
+            writer.close()
+            await writer.wait_closed()
+        await asyncio.gather(*self._readers)
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+
+
+# --- Experiment D3: Emulated Relay Throughput ---
+
+def run_emulator_experiment(seed=0, num_nodes=100, num_bursts=10**4, transport='queue', queue_limit=100):
+    """
+    Calibration of proc_delay and node_capacity_pps against relays that move
+    bytes. Per (H, B), the bursts are first sent as fast as the relays
+    accept them, which gives the packets/s one process sustains, then paced
+    at fractions of that rate to measure per-hop latency and backpressure.
+    All relays share one core, so the capacity is per core, not per node.
+    Unpaced overload also loses packets to drops and queues, so a paced run
+    can deliver more than that first measurement.
+    """
+    print(f"\nStarting Experiment D3: Relay Emulator ({num_nodes} relays, {transport} transport)...")
+
+    configs = [(3, 2), (4, 3)]
+    loads = (0.25, 0.5, 0.9, 1.5) # Offered load as a fraction of the measured capacity
+    suffix = '' if transport == 'queue' else f'_{transport}'
+
+    rng = np.random.default_rng(seed)
+    store = new_store(f'emulator{suffix}', {'H': 'i8', 'B': 'i8', 'OfferedPPS': 'f8', 'AchievedPPS': 'f8',
+                                            'Packets': 'i8', 'DropRate': 'f8', 'HopLatencyP50': 'f8',
+                                            'HopLatencyP99': 'f8', 'MaxQueue': 'i8', 'SenderBlocked': 'f8'})
+
+    for H, B in configs:
+        # Bursts shaped like the reference generator's, over the relays as recipients
+        protocol = GhostProtocolFast(num_nodes, rng=rng)
+        bursts = protocol.generate_tree_bursts(1, H, H, B, num_bursts=num_bursts)
+        emulator = RelayEmulator(num_nodes, bursts, queue_limit=queue_limit, transport=transport)
+        packets_per_burst = emulator.num_packets / num_bursts
+
+        capacity = None
+        for load in (None,) + loads:
+            burst_rate = None if load is None else load * capacity / packets_per_burst
+            stats = emulator.run(burst_rate)
+            if capacity is None:
+                capacity = stats.pps
+            hop_p50, hop_p99 = stats.hop_latency.quantile([0.5, 0.99]) * 1000 # ms
+            drop_rate = stats.drops / (stats.forwarded + stats.drops) * 100
+            store.append([{
+                'H': H, 'B': B,
+                'OfferedPPS': np.nan if load is None else load * capacity,
+                'AchievedPPS': stats.pps,
+                'Packets': stats.forwarded,
+                'DropRate': drop_rate,
+                'HopLatencyP50': hop_p50,
+                'HopLatencyP99': hop_p99,
+                'MaxQueue': stats.max_queue_length,
+                'SenderBlocked': stats.sender_blocked
+            }])
+            offered = 'unpaced' if load is None else f"{load:.0%} load"
+            print(f"H={H}, B={B}, {offered} -> {stats.pps:.0f} pps, drop {drop_rate:.1f}%, "
+                  f"hop latency P50 {hop_p50:.2f}ms / P99 {hop_p99:.2f}ms, max queue {stats.max_queue_length}, "
+                  f"senders blocked {stats.sender_blocked:.2f}s")
+
+    store.export_csv(f'results/results_emulator{suffix}.csv')
+    print("Experiment D3 Complete.")
+
+
+if __name__ == "__main__":
+    run_emulator_experiment()
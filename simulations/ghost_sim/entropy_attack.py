@@ -0,0 +1,753 @@
+import time
+import numpy as np
+from collections import Counter, namedtuple
+
+from . import instrumentation
+from .adaptive import mean_interval, run_adaptive
+from .entropy_model import expected_entropy
+from .figures import figure_path, pyplot
+from .rank_tracker import RankTracker
+from .result_cache import ResultCache
+from .results_store import new_store
+from .route_tree import complete_tree_chunks, random_forest
+from .sweep import run_sweep
+
+# --- Core G.H.O.S.T. Protocol Logic (Optimized) ---
+
+# How a fake slot that hit the real recipient is replaced when the real
+# recipient is above average:
+#   'resample'  - one fresh uniform draw, which may hit the real one again
+#   'shift'     - getFakeRecipient's +/- index shift from experiment.py
+#   'rejection' - getFakeRecipient's redraw loop from experiment_o.py
+FAKE_STRATEGIES = ('resample', 'shift', 'rejection')
+
+# A batch of variable-branching bursts (see GhostProtocolFast.generate_tree_bursts):
+# per node its recipient, hop, parent node and burst; per burst the node
+# carrying the real message (-1 without one)
+TreeBursts = namedtuple('TreeBursts', ['recipients', 'depth', 'parent', 'burst', 'real_node'])
+
+class GhostProtocolFast:
+    def __init__(self, num_recipients, max_deviation=0.1, track_ranks=False, rng=None, metrics=None,
+                 dense_history=False, fake_strategy='resample'):
+        if fake_strategy not in FAKE_STRATEGIES:
+            raise ValueError(f"fake_strategy must be one of {FAKE_STRATEGIES}, not {fake_strategy!r}")
+        self.num_recipients = num_recipients
+        self.max_deviation = max_deviation
+        self.fake_strategy = fake_strategy
+        # Private random stream, so parallel sweeps stay reproducible
+        self.rng = rng if rng is not None else np.random.default_rng()
+        # History is now just a counter to save memory and time. With many
+        # senders nearly every recipient appears, and a dense array indexed
+        # by ID is both smaller and vectorizable
+        self.dense_history = dense_history
+        if dense_history:
+            self.history_counts = np.zeros(num_recipients + 1, dtype=np.int64)
+        else:
+            self.history_counts = Counter()
+        self.total_packets_seen = 0
+        # Optional O(log N) rank structure for the intersection attack
+        self.rank_tracker = RankTracker(num_recipients) if track_ranks else None
+        # Optional Instrumentation; every probe is skipped when None
+        self.metrics = metrics
+
+    def generate_burst_fast(self, real_recipient, H, B, has_real_message):
+        """
+        Generates a burst of packet recipient IDs using NumPy for speed.
+        """
+        # Calculate total packets in this tree/burst
+        # Simplified model: M * B^H
+        total_packets = B ** H
+        metrics = self.metrics
+        if metrics is not None:
+            t0 = time.perf_counter()
+        
+        # 1. Generate ALL candidates uniformly at random (Vectorized)
+        # IDs are 1..num_recipients
+        candidates = self.rng.integers(1, self.num_recipients + 1, size=total_packets)
+        
+        if metrics is not None:
+            t1 = time.perf_counter()
+            metrics.add_time('candidates', t1 - t0)
+        
+        # 2. Protocol Logic: "If fake == real AND real is frequent, pick again"
+        # Find indices where we accidentally picked the real recipient
+        collision_indices = np.where(candidates == real_recipient)[0]
+        resampled = 0
+        
+        if len(collision_indices) > 0 and self.fake_strategy != 'resample':
+            if self.total_packets_seen > 0:
+                reals = np.full(len(collision_indices), real_recipient)
+                candidates[collision_indices], resampled = self._replace_collisions(reals)
+        elif len(collision_indices) > 0:
+            # Check if real recipient is "above average" frequency
+            # Optimization: Just calculate mean freq on the fly
+            if self.total_packets_seen > 0:
+                mean_freq = self.total_packets_seen / self.num_recipients
+                # Add random deviation (0 to max_deviation)
+                threshold = mean_freq * (1 + self.rng.uniform(0, self.max_deviation))
+                
+                real_freq = self.history_counts[real_recipient]
+                
+                if real_freq > threshold:
+                    # Resample these specific collision indices
+                    # Simple resampling: just pick random again, once, so the
+                    # real recipient can come back (see FAKE_STRATEGIES for
+                    # the paper's exact rules)
+                    new_picks = self.rng.integers(1, self.num_recipients + 1, size=len(collision_indices))
+                    candidates[collision_indices] = new_picks
+                    resampled = len(collision_indices)
+
+        # 3. Inject the REAL message if needed
+        if has_real_message:
+            # Pick a random slot to be the real message
+            real_idx = self.rng.integers(0, total_packets)
+            candidates[real_idx] = real_recipient
+
+        if metrics is not None:
+            metrics.add_time('collisions', time.perf_counter() - t1)
+            self._count_burst(1, total_packets, len(collision_indices), resampled, int(has_real_message))
+            
+        return candidates
+
+    def generate_bursts_batch(self, real_recipient, H, B, num_bursts, has_real_message=True, out=None):
+        """
+        Generates num_bursts bursts at once as a (num_bursts, B**H) array.
+        Same logic as calling generate_burst_fast num_bursts times without
+        updating history in between. real_recipient is one ID or one ID per
+        burst (many senders). Pass `out` to reuse a buffer of that shape.
+        """
+        total_packets = B ** H
+        if out is None:
+            out = np.empty((num_bursts, total_packets), dtype=np.int32)
+        metrics = self.metrics
+        if metrics is not None:
+            t0 = time.perf_counter()
+
+        out[...] = self.rng.integers(1, self.num_recipients + 1, size=out.shape, dtype=out.dtype)
+
+        if metrics is not None:
+            t1 = time.perf_counter()
+            metrics.add_time('candidates', t1 - t0)
+        collisions = resampled = 0
+
+        if self.total_packets_seen > 0:
+            real = np.broadcast_to(np.asarray(real_recipient), (num_bursts,))
+            if self.fake_strategy != 'resample':
+                rows, cols = np.nonzero(out == real[:, None])
+                collisions = len(rows)
+                out[rows, cols], resampled = self._replace_collisions(real[rows])
+            else:
+                mean_freq = self.total_packets_seen / self.num_recipients
+                # One random deviation per burst, as in generate_burst_fast
+                thresholds = mean_freq * (1 + self.rng.uniform(0, self.max_deviation, size=num_bursts))
+                rows, cols = np.nonzero(out == real[:, None])
+                real_freq = self._history_of(real[rows])
+                resample = real_freq > thresholds[rows]
+                collisions = len(rows)
+                rows, cols = rows[resample], cols[resample]
+                out[rows, cols] = self.rng.integers(1, self.num_recipients + 1, size=len(rows))
+                resampled = len(rows)
+        elif metrics is not None:
+            # Nothing is resampled without history; collisions are only counted
+            collisions = np.count_nonzero(out == np.asarray(real_recipient).reshape(-1, 1))
+
+        if has_real_message:
+            real_cols = self.rng.integers(0, total_packets, size=num_bursts)
+            out[np.arange(num_bursts), real_cols] = real_recipient
+
+        if metrics is not None:
+            metrics.add_time('collisions', time.perf_counter() - t1)
+            self._count_burst(num_bursts, out.size, collisions, resampled,
+                              num_bursts if has_real_message else 0)
+
+        return out
+
+    def stream_burst(self, real_recipient, H, B, has_real_message=True, chunk_size=1 << 20, levels='last'):
+        """
+        Yields a burst as (recipients, depth, parent) chunks of at most
+        chunk_size packets, so B**H never has to fit in memory.
+        levels='last' streams the B**H packets of generate_burst_fast;
+        levels='all' also streams the intermediate hops of the complete
+        B-ary tree (see route_tree.complete_tree_chunks). The above-average
+        check is made once when the stream starts, so consumers may update
+        history while the burst is still streaming. The real message lands
+        on a random packet of the last hop. Draws happen in a different order
+        than in generate_burst_fast: same distribution, different numbers.
+        """
+        metrics = self.metrics
+        resample = False
+        if self.total_packets_seen > 0 and self.fake_strategy == 'resample':
+            mean_freq = self.total_packets_seen / self.num_recipients
+            threshold = mean_freq * (1 + self.rng.uniform(0, self.max_deviation))
+            resample = self.history_counts[real_recipient] > threshold
+        real_idx = self.rng.integers(0, B ** H) if has_real_message else -1
+        if metrics is not None:
+            self._count_burst(1, 0, 0, 0, int(has_real_message))
+
+        last_hop_start = 0  # Position within hop H of the current chunk
+        for depth, parent in complete_tree_chunks(H, B, chunk_size, levels):
+            if metrics is not None:
+                t0 = time.perf_counter()
+            n = len(depth)
+            recipients = self.rng.integers(1, self.num_recipients + 1, size=n, dtype=np.int32)
+
+            collision_indices = np.flatnonzero(recipients == real_recipient)
+            replaced = len(collision_indices) if resample else 0
+            if resample:
+                recipients[collision_indices] = self.rng.integers(1, self.num_recipients + 1,
+                                                                  size=len(collision_indices))
+            elif self.fake_strategy != 'resample' and self.total_packets_seen > 0:
+                reals = np.full(len(collision_indices), real_recipient)
+                recipients[collision_indices], replaced = self._replace_collisions(reals)
+            if depth[0] == H:
+                if last_hop_start <= real_idx < last_hop_start + n:
+                    recipients[real_idx - last_hop_start] = real_recipient
+                last_hop_start += n
+
+            if metrics is not None:
+                metrics.add_time('candidates', time.perf_counter() - t0)
+                metrics.count('packets', n)
+                metrics.count('collisions', len(collision_indices))
+                metrics.count('resamples', replaced)
+            yield recipients, depth, parent
+
+    def generate_tree_bursts(self, real_recipient, min_hops, max_hops, max_branching, num_bursts=1,
+                             has_real_message=True, real_fills_hop=False):
+        """
+        Generates num_bursts bursts with the reference generator's shape
+        instead of B**H packets: a random hop count in [min_hops, max_hops],
+        a root on hop 0 and randint(1, max_branching) children per node (see
+        route_tree.random_forest). Returns a TreeBursts whose arrays describe
+        all bursts as one breadth-first forest.
+
+        Every node is a packet. Recipients are drawn for the whole forest at
+        once and pass the same fake-recipient gate as generate_bursts_batch
+        (real_recipient is one ID or one per burst). The real message goes
+        to one random node of a random hop in [1, hops]; real_fills_hop=True
+        puts it on every node of that hop, as getHops did.
+        """
+        if has_real_message and min_hops < 1:
+            raise ValueError("a burst with a real message needs min_hops >= 1")
+        metrics = self.metrics
+        if metrics is not None:
+            t0 = time.perf_counter()
+
+        depth, parent, burst, hops = random_forest(num_bursts, min_hops, max_hops, max_branching, self.rng)
+        recipients = self.rng.integers(1, self.num_recipients + 1, size=len(depth), dtype=np.int32)
+
+        if metrics is not None:
+            t1 = time.perf_counter()
+            metrics.add_time('candidates', t1 - t0)
+
+        real = np.broadcast_to(np.asarray(real_recipient), (num_bursts,))
+        hits = np.flatnonzero(recipients == (real[burst] if np.ndim(real_recipient) else real_recipient))
+        resampled = 0
+        if self.total_packets_seen > 0 and len(hits):
+            if self.fake_strategy != 'resample':
+                recipients[hits], resampled = self._replace_collisions(real[burst[hits]])
+            else:
+                mean_freq = self.total_packets_seen / self.num_recipients
+                thresholds = mean_freq * (1 + self.rng.uniform(0, self.max_deviation, size=num_bursts))
+                resample = hits[self._history_of(real[burst[hits]]) > thresholds[burst[hits]]]
+                recipients[resample] = self.rng.integers(1, self.num_recipients + 1, size=len(resample))
+                resampled = len(resample)
+
+        real_node = np.full(num_bursts, -1, dtype=np.int64)
+        if has_real_message:
+            real_hop = self.rng.integers(1, hops + 1)
+            draw = self.rng.random(num_bursts)
+            # Within a hop nodes are sorted by burst, so each burst's nodes on
+            # its real hop are one range, found by binary search
+            level_bounds = np.searchsorted(depth, np.arange(max_hops + 2))
+            for hop in range(1, max_hops + 1):
+                start, end = level_bounds[hop], level_bounds[hop + 1]
+                bursts_here = np.flatnonzero(real_hop == hop)
+                level_burst = burst[start:end]
+                lo = np.searchsorted(level_burst, bursts_here, side='left')
+                hi = np.searchsorted(level_burst, bursts_here, side='right')
+                real_node[bursts_here] = start + lo + (draw[bursts_here] * (hi - lo)).astype(np.int64)
+                if real_fills_hop:
+                    fill = np.flatnonzero(real_hop[level_burst] == hop)
+                    recipients[start + fill] = real[level_burst[fill]]
+            recipients[real_node] = real
+
+        if metrics is not None:
+            metrics.add_time('collisions', time.perf_counter() - t1)
+            self._count_burst(num_bursts, len(recipients), len(hits), resampled,
+                              num_bursts if has_real_message else 0)
+
+        return TreeBursts(recipients, depth, parent, burst, real_node)
+
+    def _history_of(self, ids):
+        if self.dense_history:
+            return self.history_counts[ids]
+        return np.array([self.history_counts[r] for r in np.asarray(ids).tolist()], dtype=np.int64)
+
+    def _above_average(self, ids):
+        """
+        aboveAverage for each ID, with a fresh random deviation per check as
+        in the legacy scripts. The mean is the protocol's (total packets /
+        num_recipients), the same one 'resample' uses.
+        """
+        mean_freq = self.total_packets_seen / self.num_recipients
+        thresholds = mean_freq * (1 + self.rng.uniform(0, self.max_deviation, size=len(ids)))
+        return self._history_of(ids) > thresholds
+
+    def _replace_collisions(self, real):
+        """
+        Exact, vectorized getFakeRecipient for fake slots that drew their
+        burst's real recipient (real holds it, one per slot), under the
+        'shift' or 'rejection' strategy. Returns the new recipients, which
+        are the real one again where the rule keeps it, and the number of
+        slots whose real recipient was above average.
+        """
+        N = self.num_recipients
+        real = np.asarray(real)
+        recipients = real.astype(np.int64)
+        above = np.flatnonzero(self._above_average(recipients))
+        if self.fake_strategy == 'shift':
+            # mod = randint(1, N-1); plus clamps at the last index; minus
+            # falls back to index 0 if below it and recipient 1 is not above
+            # average, else to a uniform index that is not checked again
+            index = recipients[above] - 1
+            mod = self.rng.integers(1, N, size=len(above))
+            plus = self.rng.random(len(above)) < 0.5
+            shifted = np.where(plus, np.minimum(index + mod, N - 1), index - mod)
+            minus = np.flatnonzero(~plus)
+            below_zero = minus[shifted[minus] < 0]
+            to_zero = np.zeros(len(above), dtype=bool)
+            to_zero[below_zero] = ~self._above_average(np.ones(len(below_zero), dtype=np.int64))
+            redraw = minus[~to_zero[minus]]
+            shifted[to_zero] = 0
+            shifted[redraw] = self.rng.integers(0, N, size=len(redraw))
+            recipients[above] = shifted + 1
+        else:
+            # while fake == real and aboveAverage(real): redraw
+            pending = above
+            while len(pending):
+                recipients[pending] = self.rng.integers(1, N + 1, size=len(pending))
+                pending = pending[recipients[pending] == real[pending]]
+                pending = pending[self._above_average(real[pending])]
+        return recipients, len(above)
+
+    def consume(self, recipients, depth, parent):
+        """
+        Stream consumer: adds one stream_burst chunk to the history. Counts
+        the chunk with np.unique first, as Counter.update on a million-packet
+        array would iterate it element by element.
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            t0 = time.perf_counter()
+        if self.dense_history:
+            np.add.at(self.history_counts, recipients, 1)
+        else:
+            ids, counts = np.unique(recipients, return_counts=True)
+            self.history_counts.update(dict(zip(ids.tolist(), counts.tolist())))
+        self.total_packets_seen += len(recipients)
+        if metrics is not None:
+            metrics.add_time('history_update', time.perf_counter() - t0)
+            metrics.gauge_max('history_recipients', self._history_size())
+            metrics.gauge_max('history_packets', self.total_packets_seen)
+        if self.rank_tracker is not None:
+            self.rank_tracker.update(recipients)
+
+    def _count_burst(self, bursts, packets, collisions, resampled, injected):
+        metrics = self.metrics
+        metrics.count('bursts', bursts)
+        metrics.count('packets', packets)
+        metrics.count('collisions', collisions)
+        metrics.count('resamples', resampled)
+        metrics.count('real_injections', injected)
+
+    def _history_size(self):
+        if self.dense_history:
+            return np.count_nonzero(self.history_counts)
+        return len(self.history_counts)
+
+    def update_history(self, burst_array):
+        metrics = self.metrics
+        if metrics is not None:
+            t0 = time.perf_counter()
+        # Efficiently update global counters
+        if self.dense_history:
+            np.add.at(self.history_counts, burst_array, 1)
+        else:
+            self.history_counts.update(burst_array)
+        self.total_packets_seen += len(burst_array)
+        if metrics is not None:
+            t1 = time.perf_counter()
+            metrics.add_time('history_update', t1 - t0)
+            metrics.gauge_max('history_recipients', self._history_size())
+            metrics.gauge_max('history_packets', self.total_packets_seen)
+        if self.rank_tracker is not None:
+            self.rank_tracker.update(burst_array)
+            if metrics is not None:
+                metrics.add_time('rank_update', time.perf_counter() - t1)
+
+    def rank_of(self, recipients):
+        """
+        Rank of one or many recipients by history count (1 = most frequent).
+        Requires track_ranks=True.
+        """
+        if self.rank_tracker is None:
+            raise ValueError("rank tracking is disabled; create the protocol with track_ranks=True")
+        return self.rank_tracker.rank(recipients)
+
+def row_entropies(sessions, num_recipients):
+    """
+    Shannon entropy (bits) of the recipient distribution of each row.
+    All rows are counted with a single bincount by offsetting row i's IDs
+    by i * (num_recipients + 1).
+    """
+    num_sessions, row_len = sessions.shape
+    width = num_recipients + 1
+    offsets = (np.arange(num_sessions, dtype=np.int64) * width)[:, None]
+    counts = np.bincount((sessions + offsets).ravel(), minlength=num_sessions * width)
+    counts = counts.reshape(num_sessions, width)
+
+    p = counts / row_len
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(counts > 0, p * np.log2(p), 0.0)
+    return -terms.sum(axis=1)
+
+# --- Streaming consumers ---
+
+class BurstCounts:
+    """
+    Stream consumer: packets per recipient, for the entropy of a burst.
+    """
+
+    def __init__(self, num_recipients):
+        self.counts = np.zeros(num_recipients + 1, dtype=np.int64)
+
+    def consume(self, recipients, depth, parent):
+        self.counts += np.bincount(recipients, minlength=len(self.counts))
+
+    def entropy(self):
+        counts = self.counts[self.counts > 0]
+        p = counts / counts.sum()
+        return -np.sum(p * np.log2(p))
+
+
+class RelayLoad:
+    """
+    Stream consumer: packets received and forwarded per relay. In the
+    complete B-ary tree every node above hop H forwards exactly B packets,
+    so forwarding is counted without looking up children. Stream with
+    levels='all' to see the intermediate hops.
+    """
+
+    def __init__(self, num_relays, H, B):
+        self.H = H
+        self.B = B
+        self.received = np.zeros(num_relays + 1, dtype=np.int64)
+        self.forwarded = np.zeros(num_relays + 1, dtype=np.int64)
+
+    def consume(self, recipients, depth, parent):
+        self.received += np.bincount(recipients, minlength=len(self.received))
+        if depth[0] < self.H:
+            # Chunks never span hops, so a chunk is all-forwarding or all-leaves
+            self.forwarded += self.B * np.bincount(recipients, minlength=len(self.forwarded))
+
+
+def consume_stream(chunks, *consumers):
+    """
+    Feeds every (recipients, depth, parent) chunk to each consumer's
+    consume(), so one pass over a stream serves all of them.
+    """
+    for chunk in chunks:
+        for consumer in consumers:
+            consumer.consume(*chunk)
+    return consumers
+
+# --- Experiment B: Shannon Entropy ---
+
+def entropy_task(config, trial, rng):
+    """
+    One sweep task: entropies of config['sessions'] independent sessions.
+    Returns (session entropies, seconds spent).
+    """
+    start_time = time.time()
+    H, B = config['H'], config['B']
+    msgs_per_session = config['msgs_per_session']
+    num_sessions = config['sessions']
+    num_recipients = config['num_recipients']
+    # Upper bound on packets generated per batch (keeps the buffer ~16 MB)
+    max_batch_packets = 1 << 22
+
+    # Sessions never update history, so a whole chunk of sessions is
+    # generated as one 2-D array: one row per session.
+    protocol = GhostProtocolFast(num_recipients, rng=rng, metrics=instrumentation.current())
+    session_packets = msgs_per_session * B ** H
+    chunk = max(1, min(num_sessions, max_batch_packets // session_packets))
+    buffer = np.empty((chunk * msgs_per_session, B ** H), dtype=np.int32)
+
+    session_entropies = np.empty(num_sessions)
+
+    for start in range(0, num_sessions, chunk):
+        n = min(chunk, num_sessions - start)
+        bursts = protocol.generate_bursts_batch(config['real_recipient'], H, B, n * msgs_per_session,
+                                                has_real_message=True,
+                                                out=buffer[:n * msgs_per_session])
+        if protocol.metrics is not None:
+            t0 = time.perf_counter()
+        session_entropies[start:start + n] = row_entropies(bursts.reshape(n, session_packets),
+                                                           num_recipients)
+        if protocol.metrics is not None:
+            protocol.metrics.add_time('entropy', time.perf_counter() - t0)
+
+    return session_entropies, time.time() - start_time
+
+def run_entropy_experiment(seed=0, workers=None, use_cache=True, metrics=None, rel_error=None,
+                           max_sessions=50000):
+    """
+    With rel_error (e.g. 1e-4), each cell samples sessions until the 95%
+    confidence interval of its mean entropy is within that relative error,
+    or max_sessions have run.
+    """
+    print("Starting Experiment B: Shannon Entropy Analysis (Optimized)...")
+    
+    # Reasonable Parameters for Simulation
+    H_values = [3, 4, 5, 6]
+    B_values = [2, 3, 4, 5]
+    num_runs = 5000
+    num_recipients = 1000
+    real_recipient = 42
+
+    # The paper implies entropy of the AGGREGATE distribution over time,
+    # so we simulate independent "sessions" of msgs_per_session messages
+    # and measure the entropy of the *resulting* distribution for each
+    # session. Std Dev is taken across sessions.
+    msgs_per_session = 20
+    num_sessions = num_runs // msgs_per_session
+    # Sessions are split into tasks so one cell can use several workers
+    sessions_per_task = 25
+    num_tasks = num_sessions // sessions_per_task
+
+    configs = [{'H': H, 'B': B,
+                'msgs_per_session': msgs_per_session,
+                'sessions': sessions_per_task,
+                'num_recipients': num_recipients,
+                'real_recipient': real_recipient}
+               for H in H_values for B in B_values]
+
+    def mean_entropy_interval(tasks):
+        return mean_interval(np.concatenate([entropies for entropies, _ in tasks]))
+
+    cell_results = run_adaptive(entropy_task, configs, mean_entropy_interval, num_tasks,
+                                rel_error=rel_error, max_trials=max_sessions // sessions_per_task,
+                                master_seed=seed, workers=workers,
+                                cache=ResultCache() if use_cache else None, metrics=metrics)
+
+    store = new_store('entropy', {'H': 'i8', 'B': 'i8', 'Entropy': 'f8', 'StdDev': 'f8',
+                                  'AnalyticEntropy': 'f8', 'AnalyticStdDev': 'f8',
+                                  'Sessions': 'i8', 'RelError': 'f8'})
+
+    print(f"{'H':<5} {'B':<5} {'Entropy (Bits)':<15} {'Std Dev':<15} {'Analytic':<15} "
+          f"{'Sessions':<10} {'Rel Error':<10} {'Time (s)':<10}")
+    print("-" * 100)
+
+    for config, cell in zip(configs, cell_results):
+        H, B = config['H'], config['B']
+        tasks = cell.trials
+        session_entropies = np.concatenate([entropies for entropies, _ in tasks])
+        # Summed over the cell's tasks, i.e. CPU time rather than wall time
+        elapsed = sum(seconds for _, seconds in tasks)
+
+        mean_entropy = np.mean(session_entropies)
+        std_entropy = np.std(session_entropies)
+        # Closed-form check of the Monte Carlo estimate
+        analytic = expected_entropy(H, B, msgs_per_session, num_recipients)
+        
+        print(f"{H:<5} {B:<5} {mean_entropy:.4f}          {std_entropy:.4f}          "
+              f"{analytic.mean:.4f}          {len(session_entropies):<10} {cell.rel_error:<10.2e} {elapsed:.2f}")
+        store.append([{'H': H, 'B': B, 'Entropy': mean_entropy, 'StdDev': std_entropy,
+                       'AnalyticEntropy': analytic.mean, 'AnalyticStdDev': analytic.std,
+                       'Sessions': len(session_entropies), 'RelError': cell.rel_error}])
+
+    # Save Results
+    store.export_csv('results/results_entropy.csv')
+    
+    print("Experiment B Complete.")
+
+# --- Experiment B2: Entropy and relay load of very large bursts ---
+
+def large_burst_task(config, trial, rng):
+    """
+    One sweep task: one streamed burst of the complete tree. Returns
+    (entropy of the last hop, max packets handled by one relay, seconds).
+    """
+    start_time = time.time()
+    H, B = config['H'], config['B']
+    protocol = GhostProtocolFast(config['num_recipients'], rng=rng, metrics=instrumentation.current())
+    counts = BurstCounts(config['num_recipients'])
+    load = RelayLoad(config['num_recipients'], H, B)
+
+    chunks = protocol.stream_burst(config['real_recipient'], H, B, has_real_message=True,
+                                   chunk_size=config['chunk_size'], levels='all')
+    for recipients, depth, parent in chunks:
+        load.consume(recipients, depth, parent)
+        if depth[0] == H:
+            counts.consume(recipients, depth, parent)
+
+    handled = load.received + load.forwarded
+    return float(counts.entropy()), int(handled.max()), time.time() - start_time
+
+def run_large_burst_experiment(seed=0, workers=None, use_cache=True, metrics=None):
+    print("\nStarting Experiment B2: Streaming Large Bursts...")
+
+    # Configurations beyond the materialized sweep (11**8 = 214M packets)
+    configs = [(6, 5), (7, 5), (8, 5), (6, 7), (7, 7), (8, 7), (6, 11), (7, 11), (8, 11)]
+    num_bursts = 3
+    num_recipients = 1000
+    real_recipient = 42
+    chunk_size = 1 << 20
+
+    task_configs = [{'H': H, 'B': B,
+                     'num_recipients': num_recipients,
+                     'real_recipient': real_recipient,
+                     'chunk_size': chunk_size}
+                    for H, B in configs]
+    cell_results = run_sweep(large_burst_task, task_configs, num_bursts, master_seed=seed, workers=workers,
+                             cache=ResultCache() if use_cache else None, metrics=metrics)
+
+    store = new_store('entropy_large', {'H': 'i8', 'B': 'i8', 'Packets': 'i8', 'Entropy': 'f8',
+                                        'StdDev': 'f8', 'MaxRelayLoad': 'f8'})
+
+    print(f"{'H':<5} {'B':<5} {'Packets':<12} {'Entropy (Bits)':<15} {'Max Relay Load':<15} {'Time (s)':<10}")
+    print("-" * 70)
+
+    for config, bursts in zip(task_configs, cell_results):
+        H, B = config['H'], config['B']
+        entropies = np.array([entropy for entropy, _, _ in bursts])
+        max_load = np.mean([handled for _, handled, _ in bursts])
+        elapsed = sum(seconds for _, _, seconds in bursts)
+
+        print(f"{H:<5} {B:<5} {B ** H:<12} {entropies.mean():.4f}          {max_load:<15.0f} {elapsed:.2f}")
+        store.append([{'H': H, 'B': B, 'Packets': B ** H, 'Entropy': entropies.mean(),
+                       'StdDev': entropies.std(), 'MaxRelayLoad': max_load}])
+
+    store.export_csv('results/results_entropy_large.csv')
+
+    print("Experiment B2 Complete.")
+
+# --- Experiment A: Intersection Attack ---
+
+def intersection_task(config, trial, rng):
+    """
+    One sweep task: a single attack trial. Returns the real recipient's
+    rank after each round.
+    """
+    protocol = GhostProtocolFast(config['num_recipients'], track_ranks=True, rng=rng,
+                                 metrics=instrumentation.current(),
+                                 fake_strategy=config.get('fake_strategy', 'resample'))
+    ranks = np.zeros(config['num_rounds'])
+
+    for r in range(config['num_rounds']):
+        burst = protocol.generate_burst_fast(config['real_recipient'], config['H'], config['B'],
+                                             has_real_message=True)
+        protocol.update_history(burst)
+        
+        # Rank = 1 + number of recipients seen more often than the real one
+        ranks[r] = protocol.rank_of(config['real_recipient'])
+
+    return ranks
+
+def run_intersection_experiment(seed=0, workers=None, use_cache=True, metrics=None, rel_error=None,
+                                max_trials=1000, fake_strategy='resample'):
+    """
+    With rel_error (e.g. 0.05), each config runs trials until the 95%
+    confidence interval of the mean rank is within that relative error in
+    every round, or max_trials have run. fake_strategy is one of
+    FAKE_STRATEGIES; other than 'resample' it suffixes the output names.
+    """
+    print("\nStarting Experiment A: Intersection Attack Resilience (Aggregate)...")
+    
+    num_recipients = 1000
+    real_recipient = 100
+    # Reduced rounds to focus on the saturation point (user requested "left part is cramped")
+    num_rounds = 60 
+    num_trials = 20  # Run 20 trials to get aggregate stats
+    
+    # Optimized Configs
+    configs = [
+        {'H': 3, 'B': 2, 'label': 'Weak (H=3, B=2)'},
+        {'H': 4, 'B': 3, 'label': 'Medium (H=4, B=3)'},
+        {'H': 5, 'B': 3, 'label': 'Strong (H=5, B=3)'}
+    ]
+
+    print(f"Simulating attack for {len(configs)} configs ({num_trials} trials each)...")
+    task_configs = [{'H': config['H'], 'B': config['B'],
+                     'num_recipients': num_recipients,
+                     'real_recipient': real_recipient,
+                     'num_rounds': num_rounds}
+                    for config in configs]
+    suffix = ''
+    if fake_strategy != 'resample':
+        # Only set when needed, so the default keeps its seeds and cache entries
+        for task_config in task_configs:
+            task_config['fake_strategy'] = fake_strategy
+        suffix = f'_{fake_strategy}'
+    trial_results = run_adaptive(intersection_task, task_configs, mean_interval, num_trials,
+                                 rel_error=rel_error, max_trials=max_trials, master_seed=seed, workers=workers,
+                                 cache=ResultCache() if use_cache else None, metrics=metrics)
+    
+    # Full per-trial rank curves, one row per trial
+    store = new_store(f'intersection_ranks{suffix}', {'H': 'i8', 'B': 'i8', 'Trial': 'i8',
+                                             'Ranks': ('f8', (num_rounds,))})
+    # One row per config: mean curve, trial count and achieved error
+    summary = new_store(f'intersection{suffix}', {'H': 'i8', 'B': 'i8', 'Trials': 'i8', 'RelError': 'f8',
+                                         'MeanRanks': ('f8', (num_rounds,))})
+    
+    plt = pyplot()
+    plt.figure(figsize=(10, 6))
+    
+    for config, cell in zip(configs, trial_results):
+        label = config['label']
+        
+        # Matrix: Trials x Rounds
+        all_ranks = np.array(cell.trials)
+        trials_run = len(all_ranks)
+        store.append(H=np.full(trials_run, config['H']), B=np.full(trials_run, config['B']),
+                     Trial=np.arange(trials_run), Ranks=all_ranks)
+        
+        # Calculate Stats
+        mean_ranks = np.mean(all_ranks, axis=0)
+        std_ranks = np.std(all_ranks, axis=0)
+        summary.append([{'H': config['H'], 'B': config['B'], 'Trials': trials_run,
+                         'RelError': cell.rel_error, 'MeanRanks': mean_ranks}])
+        print(f"{label}: {trials_run} trials, relative error {cell.rel_error:.2e}")
+        
+        x_axis = range(1, num_rounds + 1)
+        
+        # Plot Mean
+        p = plt.plot(x_axis, mean_ranks, label=label, linewidth=2)
+        color = p[0].get_color()
+        
+        # Fill Error Bars (+/- 1 Std Dev)
+        plt.fill_between(x_axis, 
+                         np.maximum(1, mean_ranks - std_ranks), # Rank can't be < 1
+                         mean_ranks + std_ranks, 
+                         color=color, alpha=0.2)
+
+    plt.xlabel('Messages Sent (Rounds)')
+    plt.ylabel('Rank of Real Recipient (Log Scale)')
+    plt.title('Intersection Attack Resilience (First 60 Rounds)')
+    plt.legend()
+    plt.grid(True, which="both", ls="-", alpha=0.5)
+    plt.yscale('log')
+    plt.gca().invert_yaxis() # 1 at top
+    
+    plt.tight_layout()
+    plt.savefig(figure_path(f'results_intersection_attack{suffix}.png'))
+    summary.export_csv(f'results/results_intersection{suffix}.csv')
+    print("Experiment A Complete.")
+
+def main():
+    run_entropy_experiment()
+    run_large_burst_experiment()
+    run_intersection_experiment()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
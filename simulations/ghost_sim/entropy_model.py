@@ -0,0 +1,140 @@
+import math
+from collections import namedtuple
+from statistics import NormalDist
+
+import numpy as np
+
+# Entropy of one session: its mean, standard deviation and a
+# `confidence` band for a single session, plus the method used
+EntropyEstimate = namedtuple('EntropyEstimate', ['mean', 'std', 'low', 'high', 'method'])
+
+# Above this many (k, j) pairs the trinomial covariance is approximated
+EXACT_PAIR_LIMIT = 250_000
+
+
+def _log_factorials(lo, hi):
+    """log(i!) for i = lo..hi."""
+    steps = np.log(np.arange(lo + 1, hi + 1, dtype=np.float64))
+    return math.lgamma(lo + 1) + np.concatenate(([0.0], np.cumsum(steps)))
+
+
+def _binomial_window(n, p, tail_sd=12):
+    """
+    Support window and pmf of Binom(n, p). The window spans the mean
+    +/- tail_sd standard deviations, which holds all but ~1e-30 of the mass,
+    and the pmf is renormalized over it.
+    """
+    mean = n * p
+    sd = math.sqrt(n * p * (1 - p))
+    lo = max(0, math.floor(mean - tail_sd * (sd + 1)))
+    hi = min(n, math.ceil(mean + tail_sd * (sd + 1)))
+    k = np.arange(lo, hi + 1)
+    log_pmf = (math.lgamma(n + 1) - math.lgamma(lo + 1) - math.lgamma(n - lo + 1)
+               + lo * math.log(p) + (n - lo) * math.log1p(-p))
+    # pmf(k + 1) / pmf(k) = (n - k) / (k + 1) * p / (1 - p)
+    ratios = np.log((n - k[:-1]) / (k[:-1] + 1)) + math.log(p) - math.log1p(-p)
+    log_pmf = log_pmf + np.concatenate(([0.0], np.cumsum(ratios)))
+    pmf = np.exp(log_pmf - log_pmf.max())
+    return k, pmf / pmf.sum()
+
+
+def _xlog2x(c):
+    # c * log2(c), with 0 log 0 = 0 (and 1 log 1 = 0, so clamping at 1 is exact)
+    c = np.asarray(c, dtype=np.float64)
+    return c * np.log2(np.maximum(c, 1))
+
+
+def _centered_pair_moment(n, p, k, pmf, h_first, h_second):
+    """
+    E[h_first(X) h_second(Y)] for two distinct cells X, Y of a multinomial
+    with n draws and cell probability p, via Y | X = k ~ Binom(n - k, p / (1 - p)).
+    Both h arrays are indexed like k, the marginal window of a cell.
+    """
+    q = p / (1 - p)
+    rest = n - k[:, None] - k[None, :]  # Draws left for the other cells
+    # log(i!) only over the index ranges actually used
+    lo = max(0, int(rest.min()))
+    log_fact_rest = _log_factorials(lo, n - int(k[0]))
+    log_fact_k = _log_factorials(int(k[0]), int(k[-1]))
+    k_index = k - k[0]
+
+    log_cond = (log_fact_rest[n - k - lo][:, None]
+                - log_fact_k[k_index][None, :]
+                - log_fact_rest[np.maximum(rest, lo) - lo]
+                + k[None, :] * math.log(q) + rest * math.log1p(-q))
+    log_cond = np.where(rest >= 0, log_cond, -np.inf)
+    cond = np.exp(log_cond - log_cond.max(axis=1, keepdims=True))
+    cond /= cond.sum(axis=1, keepdims=True)
+    return float(np.sum(pmf * h_first * (cond @ h_second)))
+
+
+def expected_entropy(H, B, num_messages, num_recipients, has_real_message=True, confidence=0.95,
+                     exact_pair_limit=EXACT_PAIR_LIMIT):
+    """
+    Expected Shannon entropy (bits) of the recipient distribution of one
+    session of num_messages bursts, under the sampling model of
+    GhostProtocolFast with no history (as in run_entropy_experiment).
+
+    Each burst has B**H packets: one carries the real recipient and the
+    other B**H - 1 are uniform over num_recipients. With T packets in the
+    session, entropy = log2 T - sum_j c_j log2 c_j / T, so its mean only
+    needs the binomial marginal of each count and is exact. The variance
+    needs pairs of counts; it is exact (trinomial conditionals) while the
+    pair window stays under exact_pair_limit, and otherwise uses the
+    first- plus second-order delta method. The band is mean +/- z * std,
+    the spread of single sessions (like StdDev in results_entropy.csv).
+
+    The delta method needs many packets per recipient (T / N well above
+    1). In sparse sessions it overstates the std badly: 0.20 bits against
+    0.038 exact (and by Monte Carlo) for H=3, B=2, 20 messages and 1000
+    recipients, and worse for fewer packets. Sparse sessions have narrow
+    count windows, so they take the exact path unless exact_pair_limit is
+    lowered; the window passes the default limit only when a recipient
+    expects ~400 packets or more, where both methods agree to ~1%.
+    benchmarks/check_models.py checks both against entropy_task.
+    """
+    packets = B ** H
+    T = num_messages * packets
+    N = num_recipients
+    real_packets = num_messages if has_real_message else 0
+    n = T - real_packets  # Uniform draws
+    p = 1 / N
+
+    k, pmf = _binomial_window(n, p)
+    f = _xlog2x(k)
+    mean_f = float(pmf @ f)
+    if has_real_message:
+        g = _xlog2x(k + real_packets)
+        mean_g = float(pmf @ g)
+        sum_mean = mean_g + (N - 1) * mean_f
+    else:
+        sum_mean = N * mean_f
+    mean = math.log2(T) - sum_mean / T
+
+    if len(k) ** 2 <= exact_pair_limit:
+        method = 'exact'
+        hf = f - mean_f
+        var_f = float(pmf @ hf ** 2)
+        cov_ff = _centered_pair_moment(n, p, k, pmf, hf, hf)
+        if has_real_message:
+            hg = g - mean_g
+            var_g = float(pmf @ hg ** 2)
+            cov_gf = _centered_pair_moment(n, p, k, pmf, hg, hf)
+            var_sum = var_g + (N - 1) * var_f + (N - 1) * (N - 2) * cov_ff + 2 * (N - 1) * cov_gf
+        else:
+            var_sum = N * var_f + N * (N - 1) * cov_ff
+        var = max(var_sum, 0.0) / T ** 2
+    else:
+        method = 'approx'
+        # First order: only the real recipient's cell differs from the rest
+        mu = n * p
+        slope = math.log2((mu + real_packets) / mu) if has_real_message else 0.0
+        first = n * p * (1 - p) * slope ** 2 / T ** 2
+        # Second order: (N - 1) / (2 ln^2 2) for the uniform cells
+        second = (N - 1) / (2 * math.log(2) ** 2 * T ** 2)
+        var = first + second
+
+    std = math.sqrt(var)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    upper = math.log2(min(N, T))
+    return EntropyEstimate(mean, std, max(0.0, mean - z * std), min(upper, mean + z * std), method)
@@ -0,0 +1,44 @@
+import os
+import sys
+
+# Where the paper's figures live, relative to the repository root
+DEFAULT_FIGURES_DIR = os.path.join('Private Messenger', 'figures')
+FIGURES_DIR_ENV = 'GHOST_FIGURES_DIR'
+
+_figures_dir = None
+
+
+def set_figures_dir(path):
+    global _figures_dir
+    _figures_dir = path
+
+
+def figures_dir():
+    """set_figures_dir() > $GHOST_FIGURES_DIR > 'Private Messenger/figures'."""
+    return _figures_dir or os.environ.get(FIGURES_DIR_ENV) or DEFAULT_FIGURES_DIR
+
+
+def figure_path(name):
+    """Path for figure `name` in the figures directory, which is created if needed."""
+    directory = figures_dir()
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, name)
+
+
+def pyplot(interactive=False, font_size=14):
+    """
+    matplotlib.pyplot, imported on first use so runs that never plot do not
+    pay for it. Unless interactive=True, or a backend was already chosen
+    (MPLBACKEND, or pyplot imported earlier), the non-interactive Agg
+    backend is selected, so figures render on headless machines.
+    """
+    import matplotlib
+
+    if not interactive and 'matplotlib.pyplot' not in sys.modules and not os.environ.get('MPLBACKEND'):
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    if font_size is not None:
+        # 14 is the font size of all paper figures
+        plt.rcParams.update({'font.size': font_size})
+    return plt
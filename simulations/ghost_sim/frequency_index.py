@@ -0,0 +1,54 @@
+import random
+
+
+class FrequencyIndex:
+    """
+    Running per-recipient frequency table for the fake-recipient gate.
+
+    Replaces rebuilding CountFrequency(recipientsData) on every aboveAverage
+    call: counts, the running total and the number of distinct recipients are
+    kept up to date as hops are appended, so every query is O(1).
+    """
+
+    def __init__(self, items=None):
+        self.counts = {}     # recipient ID -> number of appearances
+        self.total = 0       # sum of all counts
+        if items is not None:
+            self.update(items)
+
+    def append(self, recipientID):
+        # Same call shape as list.append so it drops into the route generators
+        self.counts[recipientID] = self.counts.get(recipientID, 0) + 1
+        self.total += 1
+
+    def update(self, items):
+        for item in items:
+            self.append(item)
+
+    def __len__(self):
+        return self.total
+
+    def count(self, recipientID):
+        return self.counts.get(recipientID, 0)
+
+    def mean(self):
+        # Mean over recipients seen so far, as getMeanFreq(CountFrequency(...))
+        if len(self.counts) == 0:
+            return 0
+        return self.total / len(self.counts)
+
+    def mean_random(self, maxDeviation):
+        mean = self.mean()
+        deviation = random.uniform(0, maxDeviation)
+        return mean * deviation + mean
+
+    def above_average(self, recipientID, maxDeviation):
+        """
+        True if recipientID has been seen more often than the randomized mean.
+        The deviation is drawn before the zero check, as in aboveAverage.
+        """
+        mean = self.mean_random(maxDeviation)
+        freq = self.count(recipientID)
+        if freq == 0:
+            return False
+        return freq > mean
@@ -0,0 +1,145 @@
+import json
+import time
+import tracemalloc
+from collections import defaultdict
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class Instrumentation:
+    """
+    Opt-in counters, per-phase timers and peak memory for the simulators.
+
+    Components keep `metrics = None` unless one of these is attached, and
+    guard every probe with `if metrics is not None`, so the disabled cost is
+    one attribute check per call. Counters are integers (bursts, packets,
+    collisions, ...), timers accumulate seconds per phase, and gauges keep
+    the maximum value seen (e.g. history size). Snapshots are plain dicts
+    that can be merged across sweep workers and dumped as JSON or in the
+    Prometheus text exposition format.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.counters = defaultdict(int)
+        self.timers = defaultdict(float)
+        self.timer_calls = defaultdict(int)
+        self.gauges = {}
+        self.trace_memory = trace_memory
+        self.peak_traced_bytes = 0
+        # Peak RSS reported by merged snapshots from other processes
+        self.peak_rss_bytes = 0
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def count(self, name, value=1):
+        self.counters[name] += int(value)
+
+    def add_time(self, phase, seconds):
+        self.timers[phase] += seconds
+        self.timer_calls[phase] += 1
+
+    def gauge_max(self, name, value):
+        if value > self.gauges.get(name, float('-inf')):
+            self.gauges[name] = value.item() if hasattr(value, 'item') else value
+
+    def peak_memory(self):
+        """(traced peak bytes or None, process max RSS bytes or None)"""
+        if self.trace_memory and tracemalloc.is_tracing():
+            self.peak_traced_bytes = max(self.peak_traced_bytes, tracemalloc.get_traced_memory()[1])
+        traced = self.peak_traced_bytes if self.trace_memory or self.peak_traced_bytes else None
+        rss = self.peak_rss_bytes or None
+        if resource is not None:
+            # ru_maxrss is in KiB on Linux
+            rss = max(self.peak_rss_bytes, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)
+        return traced, rss
+
+    def snapshot(self):
+        traced, rss = self.peak_memory()
+        return {
+            'counters': dict(self.counters),
+            'timers': {phase: {'seconds': seconds, 'calls': self.timer_calls[phase]}
+                       for phase, seconds in self.timers.items()},
+            'gauges': dict(self.gauges),
+            'peak_traced_bytes': traced,
+            'peak_rss_bytes': rss,
+        }
+
+    def merge(self, snapshot):
+        """Adds a snapshot from another process (e.g. a sweep worker)."""
+        for name, value in snapshot['counters'].items():
+            self.counters[name] += value
+        for phase, timer in snapshot['timers'].items():
+            self.timers[phase] += timer['seconds']
+            self.timer_calls[phase] += timer['calls']
+        for name, value in snapshot['gauges'].items():
+            self.gauge_max(name, value)
+        for key in ('peak_traced_bytes', 'peak_rss_bytes'):
+            if snapshot.get(key) is not None:
+                setattr(self, key, max(getattr(self, key), snapshot[key]))
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self, prefix='ghost'):
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            lines.append(f'{prefix}_{name}_total {value}')
+        if snapshot['timers']:
+            lines.append(f'# TYPE {prefix}_phase_seconds_total counter')
+            for phase, timer in sorted(snapshot['timers'].items()):
+                lines.append(f'{prefix}_phase_seconds_total{{phase="{phase}"}} {timer["seconds"]:.9f}')
+            lines.append(f'# TYPE {prefix}_phase_calls_total counter')
+            for phase, timer in sorted(snapshot['timers'].items()):
+                lines.append(f'{prefix}_phase_calls_total{{phase="{phase}"}} {timer["calls"]}')
+        gauges = dict(snapshot['gauges'])
+        for key in ('peak_traced_bytes', 'peak_rss_bytes'):
+            if snapshot[key] is not None:
+                gauges[key] = snapshot[key]
+        for name, value in sorted(gauges.items()):
+            lines.append(f'# TYPE {prefix}_{name} gauge')
+            lines.append(f'{prefix}_{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path):
+        """Writes Prometheus text for *.prom / *.txt paths, JSON otherwise."""
+        text = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        with open(path, 'w') as f:
+            f.write(text)
+
+
+# Instrumentation of the task currently running in this process, if any.
+# Sweep tasks pick it up with current() so task signatures stay unchanged.
+_current = None
+
+
+def current():
+    return _current
+
+
+def run_instrumented(fn, *args, trace_memory=False):
+    """
+    Runs fn(*args) with a fresh process-local Instrumentation active and
+    returns (result, snapshot). The phase 'task' covers the whole call.
+    With trace_memory, the traced peak is that of this call alone, and
+    tracing stops afterwards unless it was already on.
+    """
+    global _current
+    previous = _current
+    was_tracing = tracemalloc.is_tracing()
+    if trace_memory and was_tracing:
+        tracemalloc.reset_peak()
+    _current = Instrumentation(trace_memory=trace_memory)
+    try:
+        start = time.perf_counter()
+        result = fn(*args)
+        _current.add_time('task', time.perf_counter() - start)
+        return result, _current.snapshot()
+    finally:
+        _current = previous
+        if trace_memory and not was_tracing:
+            tracemalloc.stop()
@@ -0,0 +1,6 @@
+"""
+The original route-generation scripts: experiment (index shift on
+collision), experiment_w_c (the same, commented, with larger parameters)
+and experiment_o (rejection loop). Importing one runs nothing; call its
+main() to run the simulation and save the recipient histogram.
+"""
@@ -0,0 +1,33 @@
+import numpy as np
+
+from .figures import figure_path, pyplot
+
+def generate_overhead_plot():
+    H_values = np.array([2, 3, 4, 5, 6])
+    B_values = [2, 3, 4, 5]
+    
+    plt = pyplot()
+    plt.figure(figsize=(10, 6))
+    
+    for B in B_values:
+        overhead = B ** H_values
+        plt.plot(H_values, overhead, marker='o', label=f'Branching Factor B={B}', linewidth=2)
+        
+    plt.xlabel('Hop Depth (H)')
+    plt.ylabel('Overhead (Packets per Message)')
+    plt.yscale('log')
+    plt.title('Communication Overhead vs. Privacy Parameters')
+    plt.grid(True, which="both", ls="-")
+    plt.legend()
+    plt.tight_layout()
+    
+    # Save to the specific file used in the paper
+    output_path = figure_path('overhead_vs_privacy_improved.png')
+    plt.savefig(output_path)
+    print(f"Generated {output_path}")
+
+def main():
+    generate_overhead_plot()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,651 @@
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from .adaptive import quantile_interval, run_adaptive
+from .entropy_attack import GhostProtocolFast
+from .entropy_model import expected_entropy
+from .figures import figure_path, pyplot
+from .queue_sim import simulate_network
+from .quantile_sketch import QuantileSketch
+from .result_cache import ResultCache
+from .results_store import new_store
+from .sweep import run_sweep
+from .topology import topology_from_spec
+from .traffic import TrafficModel
+
+# --- Experiment C: Latency vs. Entropy Trade-off ---
+
+def simulate_latency(H, num_trials, rng, mean_hop_latency, std_hop_latency, proc_delay,
+                     chunk_size=1 << 18, sketch=None, topology=None):
+    """
+    Vectorized Monte Carlo of end-to-end latency over a path of H hops.
+    Trials are drawn chunk_size at a time as a (chunk, H) matrix and streamed
+    into a QuantileSketch, so memory stays constant however many trials run.
+    Returns the sketch (its count/sum give the exact mean).
+
+    With a Topology, each trial is a path from a random sender through H
+    random relays, timed by the topology's link latencies and per-node
+    processing delays; the three delay constants are then unused.
+    """
+    if sketch is None:
+        sketch = QuantileSketch()
+    for start in range(0, num_trials, chunk_size):
+        n = min(chunk_size, num_trials - start)
+        if topology is not None:
+            paths = rng.integers(0, topology.num_nodes, size=(n, H + 1))
+            sketch.add(topology.path_latency(paths))
+            continue
+        # Generate H random hop latencies per trial
+        hops = rng.normal(mean_hop_latency, std_hop_latency, size=(n, H))
+        # Ensure no negative latency
+        np.maximum(hops, 10, out=hops)
+        sketch.add(hops.sum(axis=1) + H * proc_delay)
+    return sketch
+
+def latency_task(config, trial, rng):
+    """
+    One sweep task: sketch of config['trials'] end-to-end latencies.
+    """
+    topology = topology_from_spec(config['topology']) if 'topology' in config else None
+    return simulate_latency(config['H'], config['trials'], rng,
+                            config['mean_hop_latency'], config['std_hop_latency'], config['proc_delay'],
+                            topology=topology)
+
+def run_latency_experiment(seed=0, workers=None, use_cache=True, num_trials=10**7, rel_error=None,
+                           max_trials=10**9, topology_nodes=None):
+    """
+    With rel_error (e.g. 0.002), each config keeps adding trials until the
+    95% confidence interval of its P99 latency is within that relative
+    error, or max_trials have run. The sketch's 0.1% accuracy is the floor.
+
+    With topology_nodes, hops are timed on a Topology of that many nodes
+    instead of the global hop constants, and results get a _topology suffix.
+    """
+    print("Starting Experiment C: Latency vs. Entropy...")
+    
+    # Parameters
+    # From previous experiment, we know Entropy corresponds roughly to H and B.
+    # Let's map H to typical Latency.
+    # Assumption: Internet latency between arbitrary P2P nodes is ~50-150ms.
+    # Let's assume Mean Hop Latency = 100ms.
+    # Processing delay (decryption/routing) = 10ms.
+    
+    mean_hop_latency = 100 # ms
+    std_hop_latency = 30
+    proc_delay = 10
+    
+    # Entropy of the aggregate distribution of 5000 messages to 1000
+    # recipients, computed analytically (see entropy_model)
+    configs = [{'H': H, 'B': B, 'Entropy': expected_entropy(H, B, 5000, 1000).mean}
+               for H, B in [(3, 2), (3, 4), (4, 2), (4, 4), (5, 3), (5, 4)]]
+    
+    # Monte Carlo simulation of Latency
+    # Path length is exactly H.
+    # Total Latency = Sum of H hops + H processing steps
+    # Trials are streamed, so num_trials only costs time (10^8 is fine)
+    num_tasks = 8
+    # Rounded up, so every requested trial runs and small counts still work
+    trials_per_task = max(1, math.ceil(num_trials / num_tasks))
+    task_configs = [{'H': config['H'], 'B': config['B'],
+                     'trials': trials_per_task,
+                     'mean_hop_latency': mean_hop_latency,
+                     'std_hop_latency': std_hop_latency,
+                     'proc_delay': proc_delay}
+                    for config in configs]
+    suffix = ''
+    if topology_nodes is not None:
+        suffix = '_topology'
+        for task_config in task_configs:
+            task_config['topology'] = {'num_nodes': topology_nodes}
+
+    def merged(tasks):
+        sketch = QuantileSketch()
+        for task_sketch in tasks:
+            sketch.merge(task_sketch)
+        return sketch
+
+    max_tasks = max(num_tasks, max_trials // trials_per_task)
+    config_results = run_adaptive(latency_task, task_configs, lambda tasks: quantile_interval(merged(tasks), 0.99),
+                                  num_tasks, rel_error=rel_error, max_trials=max_tasks,
+                                  master_seed=seed, workers=workers, cache=ResultCache() if use_cache else None)
+    
+    store = new_store(f'latency{suffix}', {'H': 'i8', 'B': 'i8', 'Entropy': 'f8', 'AvgLatency': 'f8', 'P99Latency': 'f8',
+                                  'P999Latency': 'f8', 'P9999Latency': 'f8', 'Trials': 'i8', 'RelError': 'f8'})
+    results = []
+    
+    for config, cell in zip(configs, config_results):
+        H = config['H']
+        sketch = merged(cell.trials)
+            
+        avg_latency = sketch.mean()
+        p99_latency, p999_latency, p9999_latency = sketch.quantile([0.99, 0.999, 0.9999])
+        
+        results.append({
+            'H': H,
+            'B': config['B'],
+            'Entropy': config['Entropy'],
+            'AvgLatency': avg_latency,
+            'P99Latency': p99_latency,
+            'P999Latency': p999_latency,
+            'P9999Latency': p9999_latency,
+            'Trials': sketch.count,
+            'RelError': cell.rel_error
+        })
+        
+        store.append(results[-1:])
+        print(f"H={H}, B={config['B']} -> Avg Latency: {avg_latency:.2f}ms "
+              f"(P99 relative error {cell.rel_error:.2e}, {sketch.count} trials)")
+
+    # Save Results
+    store.export_csv(f'results/results_latency{suffix}.csv')
+        
+    # Plot Entropy vs Latency
+    entropies = [r['Entropy'] for r in results]
+    latencies = [r['AvgLatency'] for r in results]
+    
+    plt = pyplot()
+    plt.figure(figsize=(10, 6)) # Increased size
+    plt.scatter(entropies, latencies, c='red', s=150) # Increased marker size
+    
+    # Label points
+    for i, txt in enumerate(results):
+        label = f"H{txt['H']}B{txt['B']}"
+        plt.annotate(label, (entropies[i], latencies[i]), xytext=(5, 5), textcoords='offset points', fontsize=12)
+        
+    plt.xlabel('Anonymity (Shannon Entropy in Bits)')
+    plt.ylabel('End-to-End Latency (ms)')
+    plt.title('Trade-off: Privacy vs. Latency')
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig(figure_path(f'results_latency_tradeoff{suffix}.png'))
+    print("Experiment C Complete.")
+
+# --- Experiment C2: Latency over Generated Burst Trees ---
+
+# Per burst, in ms after sending: arrival of the real message, of the last
+# decoy, and of the last packet overall (the makespan the sender sees)
+BurstLatency = namedtuple('BurstLatency', ['real', 'decoys', 'makespan'])
+
+def tree_latency(bursts, rng, mean_hop_latency, std_hop_latency, proc_delay, topology=None):
+    """
+    Arrival times over the trees of a TreeBursts (see
+    GhostProtocolFast.generate_tree_bursts). Every edge, sender to root and
+    parent to child, gets a normal hop delay floored at 10 ms, as in
+    simulate_latency, plus proc_delay, so a node at depth d is d + 1 timed
+    edges from the sender. Nodes are breadth-first, so each hop
+    is one gather of its parents' arrival times plus its edge delays, and
+    per-burst maxima are one reduceat per hop (within a hop nodes are sorted
+    by burst). Returns (arrival time per node, BurstLatency).
+
+    With a Topology, recipient r is relay node r - 1 and each burst leaves a
+    random sender node; edge delays are then the topology's link latency
+    plus the receiving node's processing delay.
+    """
+    depth, parent, burst, real_node = bursts.depth, bursts.parent, bursts.burst, bursts.real_node
+    num_bursts = len(real_node)
+
+    if topology is None:
+        arrival = rng.normal(mean_hop_latency, std_hop_latency, size=len(depth))
+        np.maximum(arrival, 10, out=arrival)
+        arrival += proc_delay
+    else:
+        nodes = bursts.recipients.astype(np.int64) - 1
+        if len(nodes) and nodes.max() >= topology.num_nodes:
+            raise ValueError("topology has fewer nodes than the bursts' recipients")
+        senders = rng.integers(0, topology.num_nodes, size=num_bursts)
+        src = np.where(parent >= 0, nodes[np.maximum(parent, 0)], senders[burst])
+        arrival = topology.latency(src, nodes).astype(np.float64)
+        arrival += topology.proc_delay[nodes]
+
+    has_real = real_node >= 0
+    is_real = np.zeros(len(depth), dtype=bool)
+    is_real[real_node[has_real]] = True
+
+    makespan = np.zeros(num_bursts)
+    decoys = np.zeros(num_bursts)
+    bounds = np.searchsorted(depth, np.arange(int(depth[-1]) + 2)) if len(depth) else [0]
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        if start == end:
+            continue
+        if start > 0:
+            # Hop 0 nodes are roots; deeper nodes add their parent's arrival
+            arrival[start:end] += arrival[parent[start:end]]
+        level = arrival[start:end]
+        level_burst = burst[start:end]
+        first = np.flatnonzero(np.concatenate(([True], level_burst[1:] != level_burst[:-1])))
+        owners = level_burst[first]
+        # A burst appears once per hop, so owners has no duplicates
+        makespan[owners] = np.maximum(makespan[owners], np.maximum.reduceat(level, first))
+        # The real node is skipped by giving it time 0, below any arrival
+        level_decoys = np.where(is_real[start:end], 0, level)
+        decoys[owners] = np.maximum(decoys[owners], np.maximum.reduceat(level_decoys, first))
+
+    real = np.where(has_real, arrival[np.maximum(real_node, 0)], np.nan)
+    return arrival, BurstLatency(real, decoys, makespan)
+
+def tree_latency_task(config, trial, rng):
+    """
+    One sweep task: config['bursts'] tree bursts, generated and timed
+    config['chunk'] at a time. Returns sketches of the real-message latency,
+    decoy completion and makespan, and the number of packets.
+    """
+    protocol = GhostProtocolFast(config['num_recipients'], rng=rng)
+    topology = topology_from_spec(config['topology']) if 'topology' in config else None
+    sketches = BurstLatency(QuantileSketch(), QuantileSketch(), QuantileSketch())
+    packets = 0
+    for start in range(0, config['bursts'], config['chunk']):
+        n = min(config['chunk'], config['bursts'] - start)
+        bursts = protocol.generate_tree_bursts(config['real_recipient'], config['min_hops'], config['max_hops'],
+                                               config['B'], num_bursts=n)
+        _, latency = tree_latency(bursts, rng, config['mean_hop_latency'], config['std_hop_latency'],
+                                  config['proc_delay'], topology=topology)
+        for sketch, values in zip(sketches, latency):
+            sketch.add(values)
+        packets += len(bursts.recipients)
+    return sketches, packets
+
+def run_tree_latency_experiment(seed=0, workers=None, use_cache=True, num_bursts=10**6,
+                                topology_nodes=None):
+    """
+    Latency measured on generated burst trees: 1..B children per node and
+    the real message on a random hop, instead of a path of exactly H hops.
+    Same hop delay model and configs as Experiment C, or with
+    topology_nodes, a Topology whose nodes are the recipients.
+
+    H counts timed edges, as in simulate_latency: the sender's edge to the
+    root plus H - 1 tree levels, so trees have depths 0..H-1 and their
+    deepest packets cross exactly H hops. The real message lands on depth
+    1..H-1, i.e. 2..H hops from the sender.
+    """
+    print("\nStarting Experiment C2: Latency over Generated Burst Trees...")
+
+    mean_hop_latency = 100 # ms
+    std_hop_latency = 30
+    proc_delay = 10
+
+    configs = [(3, 2), (3, 4), (4, 2), (4, 4), (5, 3), (5, 4)]
+    num_tasks = 8
+    # Trees of depth H - 1: with the sender's edge, the deepest path is H hops
+    task_configs = [{'H': H, 'B': B, 'min_hops': H - 1, 'max_hops': H - 1,
+                     'bursts': max(1, math.ceil(num_bursts / num_tasks)),
+                     'chunk': max(1, (1 << 22) // B ** H),  # ~4M packets per batch at most
+                     'num_recipients': 1000,
+                     'real_recipient': 42,
+                     'mean_hop_latency': mean_hop_latency,
+                     'std_hop_latency': std_hop_latency,
+                     'proc_delay': proc_delay}
+                    for H, B in configs]
+    suffix = ''
+    if topology_nodes is not None:
+        suffix = '_topology'
+        for task_config in task_configs:
+            task_config['num_recipients'] = topology_nodes
+            task_config['topology'] = {'num_nodes': topology_nodes}
+    config_results = run_sweep(tree_latency_task, task_configs, num_tasks, master_seed=seed, workers=workers,
+                               cache=ResultCache() if use_cache else None)
+
+    store = new_store(f'tree_latency{suffix}', {'H': 'i8', 'B': 'i8', 'Bursts': 'i8', 'PacketsPerBurst': 'f8',
+                                       'RealAvg': 'f8', 'RealP99': 'f8', 'DecoysAvg': 'f8', 'DecoysP99': 'f8',
+                                       'MakespanAvg': 'f8', 'MakespanP99': 'f8'})
+
+    for (H, B), tasks in zip(configs, config_results):
+        merged = BurstLatency(QuantileSketch(), QuantileSketch(), QuantileSketch())
+        for sketches, _ in tasks:
+            for total, sketch in zip(merged, sketches):
+                total.merge(sketch)
+        packets = sum(task_packets for _, task_packets in tasks)
+        row = {'H': H, 'B': B, 'Bursts': merged.real.count, 'PacketsPerBurst': packets / merged.real.count}
+        for name, sketch in zip(('Real', 'Decoys', 'Makespan'), merged):
+            row[f'{name}Avg'] = sketch.mean()
+            row[f'{name}P99'] = sketch.quantile(0.99)
+        store.append([row])
+        print(f"H={H}, B={B} -> real {row['RealAvg']:.1f}ms (P99 {row['RealP99']:.1f}), "
+              f"decoys done {row['DecoysAvg']:.1f}ms, makespan {row['MakespanAvg']:.1f}ms "
+              f"(P99 {row['MakespanP99']:.1f}), {row['PacketsPerBurst']:.1f} packets/burst")
+
+    store.export_csv(f'results/results_tree_latency{suffix}.csv')
+    print("Experiment C2 Complete.")
+
+# --- Experiment D: Network Saturation (Stress Test) ---
+
+def run_saturation_experiment():
+    print("\nStarting Experiment D: Network Saturation...")
+    
+    # Model:
+    # A single bottleneck router or average node bandwidth.
+    # Capacity: 5000 packets / second (P2P node)
+    
+    node_capacity_pps = 5000 
+    
+    # Scenario:
+    # 1000 Users active.
+    # Users send 1 message / second.
+    # We vary the "Privacy Settings" (H, B) which changes overhead multiplier.
+    
+    num_users = 1000
+    msg_rate = 1.0 # msg/sec
+    
+    # Test range of branching factors B (fixed H=4 for simplicity)
+    # or just test different configs directly.
+    
+    configs = [
+        {'H': 3, 'B': 2}, # Overhead = 2^3 = 8 pkts
+        {'H': 3, 'B': 3}, # 27
+        {'H': 4, 'B': 2}, # 16
+        {'H': 4, 'B': 3}, # 81
+        {'H': 5, 'B': 2}, # 32
+        {'H': 5, 'B': 3}, # 243
+        {'H': 4, 'B': 4}, # 256
+        {'H': 5, 'B': 4}, # 1024 packets per msg!
+    ]
+    
+    store = new_store('saturation', {'H': 'i8', 'B': 'i8', 'PPS': 'f8', 'Mbps': 'f8', 'DropRate': 'f8'})
+    load_results = []
+    
+    for config in configs:
+        H = config['H']
+        B = config['B']
+        
+        # Calculate Packets Per Message (Overhead)
+        # O = B^H (Approx)
+        packets_per_msg = B ** H
+        
+        # Total Network Load (PPS) = Users * Rate * O
+        total_load_pps = num_users * msg_rate * packets_per_msg
+        
+        # Drop Rate Calculation
+        # Simple Queue Model: If Load > Capacity, Drop = (Load - Cap) / Load
+        # In a P2P network, total capacity scales with users, BUT
+        # specific links saturate. Let's model "Average Node Load".
+        # In G.H.O.S.T, every user is a relay.
+        # So Total Capacity = Num_Users * Node_Capacity.
+        # Wait, if I am a user, I relay for others.
+        # Total Network Capacity = 1000 users * 5000 pps = 5,000,000 pps.
+        # Total Load = 1000 * 1 * 1024 = 1,024,000 pps.
+        # It handles it easily?
+        
+        # Reviewer Comment: "Packet size would exponentially explode... overhead analysis misleading."
+        # Actually, if Load is distributed perfectly, it scales.
+        # BUT, the sender's uplink is the bottleneck.
+        # Sender must upload B^H packets?
+        # NO. Sender uploads B packets. Each of those sends B packets.
+        # So Sender Load = B packets.
+        # Relay Load = B packets.
+        # Everyone sends B packets.
+        # Total Packets in Flight = B^H.
+        # Total Relays involved = (B^H - 1) / (B-1).
+        
+        # Bottleneck: The total number of hops consumed.
+        # Let's model "Average Bandwidth Required per User" (in Mbps).
+        # Packet size = 1KB (padded).
+        # 1 pps = 8 Kbps.
+        
+        avg_bandwidth_mbps = (total_load_pps * 8 * 1024) / (num_users * 1000000) 
+        # (Total Pkts * 8 bits * 1024 bytes) / Users / 1Mb
+        
+        # Wait, total_load_pps is total network traffic.
+        # Divide by num_users to get "Average Relay Load" per user.
+        
+        avg_load_pps_per_user = total_load_pps / num_users
+        
+        # Drop Logic: If a user has 10 Mbps upload (~1250 pps of 1KB), do they saturate?
+        limit_mbps = 10.0 # Typical upload speed
+        limit_pps = (limit_mbps * 1000000) / (8 * 1024)
+        
+        drop_rate = 0.0
+        if avg_load_pps_per_user > limit_pps:
+            drop_rate = (avg_load_pps_per_user - limit_pps) / avg_load_pps_per_user
+            
+        print(f"Config H={H}, B={B} -> Load/User: {avg_load_pps_per_user:.1f} pps ({avg_bandwidth_mbps:.2f} Mbps). Drop: {drop_rate*100:.1f}%")
+        
+        load_results.append({
+            'H': H, 'B': B, 
+            'PPS': avg_load_pps_per_user,
+            'Mbps': avg_bandwidth_mbps,
+            'DropRate': drop_rate * 100
+        })
+        store.append(load_results[-1:])
+
+    # Save Results
+    store.export_csv('results/results_saturation.csv')
+        
+    # Plot
+    labels = [f"H{r['H']}B{r['B']}" for r in load_results]
+    mbps = [r['Mbps'] for r in load_results]
+    drops = [r['DropRate'] for r in load_results]
+    
+    plt = pyplot()
+    fig, ax1 = plt.subplots(figsize=(10, 6))
+    
+    color = 'tab:blue'
+    ax1.set_xlabel('Configuration')
+    ax1.set_ylabel('Bandwidth Req (Mbps)', color=color)
+    ax1.bar(labels, mbps, color=color, alpha=0.6)
+    ax1.tick_params(axis='y', labelcolor=color)
+    ax1.axhline(y=10, color='r', linestyle='--', label='10 Mbps Limit')
+    
+    ax2 = ax1.twinx()
+    color = 'tab:red'
+    ax2.set_ylabel('Packet Drop Rate (%)', color=color)
+    ax2.plot(labels, drops, color=color, marker='o', linewidth=2)
+    ax2.tick_params(axis='y', labelcolor=color)
+    ax2.set_ylim(0, 100)
+    
+    plt.title('Network Stress Test: Bandwidth vs. Drop Rate')
+    fig.tight_layout()
+    plt.savefig(figure_path('results_saturation.png'))
+    print("Experiment D Complete.")
+
+# --- Experiment D (simulated): Network Saturation with Relay Queues ---
+
+def run_saturation_simulation(seed=0, duration_s=5.0, topology_nodes=None):
+    print("\nStarting Experiment D (simulated): Network Saturation with Relay Queues...")
+    
+    # Same scenario as run_saturation_experiment, but every relay is an explicit
+    # finite queue instead of the average-load formula, so bursts and
+    # hot links show up as measured drops and queueing delay. With
+    # topology_nodes, the users are the first nodes of a Topology of that size
+    # and links / processing take its per-pair and per-node delays.
+    num_users = 1000
+    msg_rate = 1.0 # msg/sec
+    limit_mbps = 10.0 # Typical upload speed
+    limit_pps = (limit_mbps * 1000000) / (8 * 1024) # 1 KB padded packets
+    node_capacity_pps = 5000 # Processing capacity of a P2P node
+    upload_pps = min(limit_pps, node_capacity_pps)
+    queue_limit = 100 # Packets buffered per uplink
+    
+    configs = [
+        {'H': 3, 'B': 2},
+        {'H': 3, 'B': 3},
+        {'H': 4, 'B': 2},
+        {'H': 4, 'B': 3},
+        {'H': 5, 'B': 2},
+        {'H': 5, 'B': 3},
+        {'H': 4, 'B': 4},
+        {'H': 5, 'B': 4},
+    ]
+    
+    topology = None
+    suffix = ''
+    if topology_nodes is not None:
+        topology = topology_from_spec({'num_nodes': topology_nodes})
+        suffix = '_topology'
+
+    rng = np.random.default_rng(seed)
+    store = new_store(f'saturation_sim{suffix}', {'H': 'i8', 'B': 'i8', 'PPS': 'f8', 'DropRate': 'f8',
+                                         'QueueDelayP50': 'f8', 'QueueDelayP99': 'f8',
+                                         'QueueLenP50': 'f8', 'QueueLenP99': 'f8', 'QueueLenMax': 'i8',
+                                         'LatencyP50': 'f8', 'LatencyP99': 'f8'})
+    
+    for config in configs:
+        H = config['H']
+        B = config['B']
+        
+        stats = simulate_network(num_users, H, B, duration_s, rng, msg_rate=msg_rate,
+                                 upload_pps=upload_pps, queue_limit=queue_limit, topology=topology)
+        
+        delay_p50, delay_p99 = stats.queue_delay.quantile([0.5, 0.99]) * 1000 # ms
+        qlen_p50, qlen_p99 = stats.queue_length.quantile([0.5, 0.99])
+        latency_p50, latency_p99 = stats.latency.quantile([0.5, 0.99]) * 1000 # ms, delivered packets
+        
+        print(f"Config H={H}, B={B} -> Drop: {stats.drop_rate*100:.1f}%, "
+              f"Queue delay P99: {delay_p99:.1f}ms, Queue length P99: {qlen_p99:.0f}, "
+              f"Latency P99: {latency_p99:.0f}ms "
+              f"({stats.events} events)")
+        
+        store.append([{
+            'H': H, 'B': B,
+            'PPS': stats.transmissions / (num_users * duration_s),
+            'DropRate': stats.drop_rate * 100,
+            'QueueDelayP50': delay_p50,
+            'QueueDelayP99': delay_p99,
+            'QueueLenP50': qlen_p50,
+            'QueueLenP99': qlen_p99,
+            'QueueLenMax': stats.max_queue_length,
+            'LatencyP50': latency_p50,
+            'LatencyP99': latency_p99
+        }])
+
+    # Save Results
+    store.export_csv(f'results/results_saturation_sim{suffix}.csv')
+    
+    print("Experiment D (simulated) Complete.")
+
+# --- Experiment D2: Per-Relay Load from Simulated Traffic ---
+
+def round_relay_load(round_traffic, protocol, H, B, num_relays, max_batch_packets=1 << 22):
+    """
+    Packets handled (received + forwarded, as in RelayLoad) by each relay in
+    one Round of a TrafficModel whose sender s is relay s + 1. A message's
+    complete tree has B**d packets at hop d: the last hop is the Round's
+    bursts, and each inner hop d is drawn from protocol like a burst of
+    depth d without a real message (the fake-recipient gate of stream_burst
+    with levels='all'). Inner relays forward B packets each, and the sender
+    uploads the first B. Returns an int64 array indexed by relay ID (0 unused).
+    """
+    load = np.bincount(round_traffic.bursts.ravel(), minlength=num_relays + 1)
+    real = round_traffic.recipients
+    for depth in range(1, H):
+        rows = max(1, max_batch_packets // B ** depth)
+        for start in range(0, len(real), rows):
+            end = min(start + rows, len(real))
+            relays = protocol.generate_bursts_batch(real[start:end], depth, B, end - start,
+                                                    has_real_message=False)
+            load += (1 + B) * np.bincount(relays.ravel(), minlength=num_relays + 1)
+    # A sender appears once per round
+    load[round_traffic.senders + 1] += B
+    return load
+
+def run_relay_load_experiment(seed=0, num_relays=10**4, duration_s=60, msg_rate=1.0, window_s=10):
+    """
+    Per-relay load instead of run_saturation_experiment's network average.
+    Every relay is also a sender; each simulated second is one TrafficModel
+    round of real GhostProtocolFast bursts, and relay loads are bincounts of
+    its packets. Per relay, the mean, busiest second and busiest window are
+    kept as running arrays, so memory does not grow with duration_s.
+
+    msg_rate is each relay's chance of sending in a given second, so at
+    most 1. The default is the saturation experiments' 1 msg/s. At that
+    rate H=5, B=4 (about 2700 packets/s per relay) crosses the 10 Mbps
+    limit, and the other configs stay below it (H=5, B=3 peaks near 1000).
+    At light rates such as 0.01 msg/s no config comes near the limit.
+    """
+    if not 0 < msg_rate <= 1:
+        raise ValueError(f"msg_rate must be in (0, 1] messages per relay per second, not {msg_rate}")
+    print(f"\nStarting Experiment D2: Per-Relay Load ({num_relays} relays, {duration_s}s simulated)...")
+
+    limit_mbps = 10.0 # Typical upload speed
+    limit_pps = (limit_mbps * 1000000) / (8 * 1024) # 1 KB padded packets
+
+    configs = [
+        {'H': 3, 'B': 2},
+        {'H': 4, 'B': 2},
+        {'H': 4, 'B': 3},
+        {'H': 4, 'B': 4},
+        {'H': 5, 'B': 3},
+        {'H': 5, 'B': 4},
+    ]
+
+    store = new_store('relay_load', {'H': 'i8', 'B': 'i8', 'Messages': 'i8', 'AveragePPS': 'f8',
+                                     'MeanP50': 'f8', 'MeanP99': 'f8', 'MeanMax': 'f8',
+                                     'PeakSecondP50': 'f8', 'PeakSecondP99': 'f8', 'PeakSecondMax': 'f8',
+                                     'PeakWindowP99': 'f8', 'PeakWindowMax': 'f8',
+                                     'OverLimitRelays': 'f8', 'OverLimitSeconds': 'f8'})
+    window_store = new_store('relay_load_windows', {'H': 'i8', 'B': 'i8', 'WindowStart': 'i8',
+                                                    'P50PPS': 'f8', 'P99PPS': 'f8', 'MaxPPS': 'f8',
+                                                    'OverLimit': 'f8'})
+
+    plt = pyplot()
+    plt.figure(figsize=(10, 6))
+
+    for config in configs:
+        H, B = config['H'], config['B']
+        rng = np.random.default_rng(seed)
+        traffic = TrafficModel(num_relays, num_relays, rng, H=H, B=B, send_prob=msg_rate, observe=False)
+
+        total = np.zeros(num_relays, dtype=np.int64)
+        peak_second = np.zeros(num_relays, dtype=np.int64)
+        peak_window = np.zeros(num_relays)
+        window = np.zeros(num_relays, dtype=np.int64)
+        seconds_over = np.zeros(num_relays, dtype=np.int64)
+        window_rows = []
+
+        for second in range(duration_s):
+            load = round_relay_load(traffic.step(), traffic.protocol, H, B, num_relays)[1:]
+            total += load
+            window += load
+            np.maximum(peak_second, load, out=peak_second)
+            seconds_over += load > limit_pps
+            if (second + 1) % window_s == 0 or second + 1 == duration_s:
+                length = second % window_s + 1
+                p50, p99 = np.percentile(window, [50, 99]) / length
+                window_rows.append({'H': H, 'B': B, 'WindowStart': second + 1 - length,
+                                    'P50PPS': p50, 'P99PPS': p99, 'MaxPPS': window.max() / length,
+                                    'OverLimit': np.mean(window > limit_pps * length)})
+                np.maximum(peak_window, window / length, out=peak_window)
+                window[:] = 0
+
+        mean_load = total / duration_s
+        row = {'H': H, 'B': B, 'Messages': traffic.messages, 'AveragePPS': mean_load.mean(),
+               'MeanMax': mean_load.max(), 'PeakSecondMax': peak_second.max(),
+               'PeakWindowMax': peak_window.max(),
+               'OverLimitRelays': np.mean(seconds_over > 0),
+               'OverLimitSeconds': seconds_over.sum() / (num_relays * duration_s)}
+        row['MeanP50'], row['MeanP99'] = np.percentile(mean_load, [50, 99])
+        row['PeakSecondP50'], row['PeakSecondP99'] = np.percentile(peak_second, [50, 99])
+        row['PeakWindowP99'] = np.percentile(peak_window, 99)
+        store.append([row])
+        window_store.append(window_rows)
+        print(f"Config H={H}, B={B} -> average {row['AveragePPS']:.1f} pps/relay, P99 {row['MeanP99']:.1f}, "
+              f"busiest second {row['PeakSecondMax']} pps, busiest {window_s}s window "
+              f"{row['PeakWindowMax']:.1f} pps; {row['OverLimitRelays'] * 100:.2f}% of relays "
+              f"ever over {limit_mbps:.0f} Mbps")
+
+        starts = [r['WindowStart'] / 60 for r in window_rows]
+        p = plt.plot(starts, [r['MaxPPS'] for r in window_rows], label=f"H{H}B{B} max", linewidth=2)
+        plt.plot(starts, [r['P99PPS'] for r in window_rows], label=f"H{H}B{B} P99", linestyle='--',
+                 color=p[0].get_color())
+
+    store.export_csv('results/results_relay_load.csv')
+    window_store.export_csv('results/results_relay_load_windows.csv')
+
+    plt.axhline(y=limit_pps, color='r', linestyle=':', label=f'{limit_mbps:.0f} Mbps Limit')
+    plt.xlabel('Simulated Time (minutes)')
+    plt.ylabel(f'Relay Load per {window_s}s Window (packets/s, Log Scale)')
+    plt.yscale('log')
+    plt.title('Per-Relay Load Hot Spots')
+    plt.legend()
+    plt.grid(True, which="both", ls="-", alpha=0.5)
+    plt.tight_layout()
+    plt.savefig(figure_path('results_relay_load.png'))
+    print("Experiment D2 Complete.")
+
+def main():
+    run_latency_experiment()
+    run_saturation_experiment()
+    run_saturation_simulation()
+
+if __name__ == "__main__":
+    main()
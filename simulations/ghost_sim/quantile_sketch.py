@@ -0,0 +1,89 @@
+import math
+
+import numpy as np
+
+
+class QuantileSketch:
+    """
+    Streaming quantile sketch with bounded memory and relative accuracy.
+
+    Values are counted in log-spaced buckets (DDSketch style): bucket i holds
+    values in (gamma^(i-1), gamma^i] with gamma = (1 + a) / (1 - a), so any
+    quantile is returned within relative error `a` of the exact sample
+    quantile. Memory is one counter per bucket over the range of magnitudes
+    seen (a few thousand for latencies in ms at a = 0.1%), independent of
+    the number of samples. Whole arrays are added at once with bincount,
+    and sketches from parallel tasks can be merged.
+    """
+
+    def __init__(self, relative_accuracy=0.001, min_value=1e-9):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.offset = 0                         # bucket index of counts[0]
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.zero_count = 0                     # values <= min_value
+        self.count = 0
+        self.sum = 0.0
+
+    def _reserve(self, low, high):
+        # Grow the dense bucket range to cover [low, high]
+        if len(self.counts) == 0:
+            self.offset = low
+            self.counts = np.zeros(high - low + 1, dtype=np.int64)
+            return
+        current_high = self.offset + len(self.counts) - 1
+        new_low = min(low, self.offset)
+        new_high = max(high, current_high)
+        if new_low == self.offset and new_high == current_high:
+            return
+        counts = np.zeros(new_high - new_low + 1, dtype=np.int64)
+        counts[self.offset - new_low:self.offset - new_low + len(self.counts)] = self.counts
+        self.offset = new_low
+        self.counts = counts
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+        self.count += values.size
+        self.sum += float(values.sum())
+
+        positive = values > self.min_value
+        self.zero_count += int(values.size - np.count_nonzero(positive))
+        values = values[positive]
+        if values.size == 0:
+            return
+
+        index = np.ceil(np.log(values) / self.log_gamma).astype(np.int64)
+        low, high = int(index.min()), int(index.max())
+        self._reserve(low, high)
+        self.counts += np.bincount(index - self.offset, minlength=len(self.counts))
+
+    def merge(self, other):
+        self.count += other.count
+        self.sum += other.sum
+        self.zero_count += other.zero_count
+        if len(other.counts):
+            self._reserve(other.offset, other.offset + len(other.counts) - 1)
+            start = other.offset - self.offset
+            self.counts[start:start + len(other.counts)] += other.counts
+
+    def mean(self):
+        return self.sum / self.count if self.count else float('nan')
+
+    def quantile(self, q):
+        """
+        Value at quantile q (0..1); q may be a scalar or an array.
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if self.count == 0:
+            return np.full(q.shape, np.nan)[()]
+
+        rank = q * (self.count - 1)
+        cumulative = self.zero_count + np.cumsum(self.counts)
+        bucket = np.searchsorted(cumulative, rank, side='right')
+        bucket = np.minimum(bucket, len(self.counts) - 1)
+        values = 2 * self.gamma ** (bucket + self.offset) / (self.gamma + 1)
+        return np.where(rank < self.zero_count, 0.0, values)[()]
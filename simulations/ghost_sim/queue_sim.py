@@ -0,0 +1,137 @@
+import heapq
+import math
+
+import numpy as np
+
+from .quantile_sketch import QuantileSketch
+
+
+class QueueStats:
+    """Counters and sketches collected by simulate_network."""
+
+    def __init__(self):
+        self.messages = 0
+        self.transmissions = 0      # packets accepted onto an uplink
+        self.drops = 0              # packets refused by a full queue
+        self.delivered = 0          # packets that reached the last hop
+        self.events = 0
+        self.queue_delay = QuantileSketch()   # seconds spent waiting for the uplink
+        self.queue_length = QuantileSketch()  # packets ahead at enqueue time
+        self.latency = QuantileSketch()       # seconds from send to last-hop arrival
+        self.max_queue_length = 0
+
+    @property
+    def drop_rate(self):
+        attempts = self.transmissions + self.drops
+        return self.drops / attempts if attempts else 0.0
+
+
+def simulate_network(num_nodes, H, B, duration_s, rng, msg_rate=1.0, upload_pps=1220.0,
+                     queue_limit=100, link_delay=0.1, proc_delay=0.01, batch=1 << 16, topology=None):
+    """
+    Discrete-event simulation of G.H.O.S.T. bursts over finite relay queues.
+
+    Every node is both a sender (Poisson, msg_rate messages/s) and a relay.
+    A message leaves its sender as B packets; every relay at depth < H
+    forwards B more, so a burst is B + B^2 + ... + B^H transmissions. Each
+    node has one FIFO uplink serving upload_pps packets/s with room for
+    queue_limit waiting packets; a packet arriving at a full queue is dropped.
+
+    The uplink is a single deterministic server, so its state is just the
+    time it becomes free: a packet's departure follows directly from it, and
+    only packet arrivals need heap events. Relay choices are drawn from rng
+    in blocks of `batch`. Messages are sent during [0, duration_s) and the
+    network is then drained.
+
+    With a Topology, node i is topology node i: a link takes the topology's
+    latency between its ends and a relay its own processing delay, in place
+    of link_delay and proc_delay.
+    """
+    stats = QueueStats()
+    tx_time = 1.0 / upload_pps
+    busy_until = [0.0] * num_nodes
+
+    if topology is None:
+        node_proc = [proc_delay] * num_nodes
+    else:
+        if topology.num_nodes < num_nodes:
+            raise ValueError(f"topology has {topology.num_nodes} nodes, fewer than num_nodes={num_nodes}")
+        # Plain lists in seconds: per-packet math on Python floats beats
+        # indexing NumPy arrays one element at a time
+        x, y = (topology.coords[:num_nodes].T / 1000).tolist()
+        height = (topology.height[:num_nodes] / 1000).tolist()
+        node_proc = (topology.proc_delay[:num_nodes] / 1000).tolist()
+        hypot = math.hypot
+
+    # Heap of (time, sequence, node, depth, send time); depth 0 is the sender itself
+    num_messages = rng.poisson(num_nodes * msg_rate * duration_s)
+    send_times = np.sort(rng.uniform(0, duration_s, size=num_messages))
+    senders = rng.integers(0, num_nodes, size=num_messages)
+    heap = [(t, i, s, 0, t) for i, (t, s) in enumerate(zip(send_times.tolist(), senders.tolist()))]
+    heapq.heapify(heap)
+    sequence = num_messages
+    stats.messages = num_messages
+
+    relays = rng.integers(0, num_nodes, size=batch).tolist()
+    relay_pos = 0
+
+    delays = []
+    lengths = []
+    latencies = []
+
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    while heap:
+        t, _, node, depth, sent = heappop(heap)
+        stats.events += 1
+
+        if depth == H:
+            stats.delivered += 1
+            latencies.append(t - sent)
+            continue
+
+        ready = t + node_proc[node] if depth else t
+        for _ in range(B):
+            free_at = busy_until[node]
+            backlog = free_at - ready
+            queued = math.ceil(backlog / tx_time) if backlog > 0 else 0
+            if queued >= queue_limit:
+                stats.drops += 1
+                continue
+            if queued > stats.max_queue_length:
+                stats.max_queue_length = queued
+
+            start = free_at if free_at > ready else ready
+            departure = start + tx_time
+            busy_until[node] = departure
+            stats.transmissions += 1
+            delays.append(start - ready)
+            lengths.append(queued)
+
+            if relay_pos == batch:
+                relays = rng.integers(0, num_nodes, size=batch).tolist()
+                relay_pos = 0
+            next_node = relays[relay_pos]
+            relay_pos += 1
+
+            if topology is None:
+                arrival = departure + link_delay
+            else:
+                arrival = (departure + hypot(x[node] - x[next_node], y[node] - y[next_node])
+                           + height[node] + height[next_node])
+            heappush(heap, (arrival, sequence, next_node, depth + 1, sent))
+            sequence += 1
+
+        if len(delays) >= batch:
+            stats.queue_delay.add(delays)
+            stats.queue_length.add(lengths)
+            stats.latency.add(latencies)
+            delays = []
+            lengths = []
+            latencies = []
+
+    stats.queue_delay.add(delays)
+    stats.queue_length.add(lengths)
+    stats.latency.add(latencies)
+    return stats
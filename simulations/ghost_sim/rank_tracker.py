@@ -0,0 +1,78 @@
+import numpy as np
+
+
+class RankTracker:
+    """
+    Per-recipient packet counts with O(log N) rank queries.
+
+    Alongside the counts, a Fenwick tree over count values holds how many
+    recipients currently have each count (a counts-of-counts histogram).
+    The rank of a recipient is 1 + the number of recipients with a strictly
+    higher count, the same definition the intersection attack used when it
+    scanned every count per round. Updates and queries are vectorized over
+    whole bursts / lists of targets; the tree doubles when a count outgrows it.
+    """
+
+    def __init__(self, num_recipients, initial_size=1024):
+        self.num_recipients = num_recipients
+        # Indexed by recipient ID (IDs are 1..num_recipients)
+        self.counts = np.zeros(num_recipients + 1, dtype=np.int64)
+        self.size = initial_size
+        self.tree = np.zeros(self.size + 1, dtype=np.int64)
+        # Every recipient starts with count 0
+        self._add(np.array([0]), np.array([num_recipients]))
+
+    def _add(self, values, deltas):
+        # Fenwick point update at count value v (tree position v + 1)
+        positions = np.asarray(values, dtype=np.int64) + 1
+        deltas = np.asarray(deltas, dtype=np.int64)
+        while positions.size:
+            np.add.at(self.tree, positions, deltas)
+            positions = positions + (positions & -positions)
+            keep = positions <= self.size
+            positions, deltas = positions[keep], deltas[keep]
+
+    def _count_at_most(self, values):
+        # Number of recipients whose count is <= value, for each value
+        positions = np.minimum(np.asarray(values, dtype=np.int64) + 1, self.size)
+        total = np.zeros(positions.shape, dtype=np.int64)
+        while np.any(positions):
+            total += self.tree[positions]  # tree[0] is always 0
+            positions &= positions - 1
+        return total
+
+    def _grow(self, max_value):
+        while self.size <= max_value:
+            self.size *= 2
+        # Rebuild from the histogram in O(size): each level of the implicit
+        # tree pushes its partial sums into the next one
+        tree = np.zeros(self.size + 1, dtype=np.int64)
+        tree[1:] = np.bincount(self.counts[1:], minlength=self.size)
+        step = 1
+        while step <= self.size:
+            i = np.arange(step, self.size + 1, 2 * step)
+            j = i + step
+            keep = j <= self.size
+            tree[j[keep]] += tree[i[keep]]
+            step *= 2
+        self.tree = tree
+
+    def update(self, burst_array):
+        recipients, added = np.unique(burst_array, return_counts=True)
+        old = self.counts[recipients]
+        new = old + added
+        if new.max(initial=0) >= self.size:
+            self.counts[recipients] = new
+            self._grow(new.max())
+            return
+        self.counts[recipients] = new
+        ones = np.ones(len(recipients), dtype=np.int64)
+        self._add(np.concatenate([old, new]), np.concatenate([-ones, ones]))
+
+    def rank(self, recipients):
+        """
+        Rank of each recipient (1 = most frequent). Accepts a single ID or an
+        array of IDs and returns the same shape.
+        """
+        counts = self.counts[recipients]
+        return 1 + self.num_recipients - self._count_at_most(counts)
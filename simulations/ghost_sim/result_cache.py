@@ -0,0 +1,121 @@
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import pickle
+
+# Bump to invalidate every entry after a change the source hash cannot see
+# (e.g. a NumPy upgrade that changes random streams)
+CACHE_VERSION = 1
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache for per-cell / per-task results.
+
+    The key is a SHA-256 over CACHE_VERSION, the sources of the package
+    defining the function (every .py file under it, so editing any module
+    the task imports from ghost_sim invalidates its entries), the
+    function's name, its parameters and the seed. A function outside a
+    package is keyed on its own module's source. Entries are pickles under
+    <directory>/<key[:2]>/<key>.pkl. Reads refresh the file's mtime, and
+    writes evict the least recently used entries down to 90% of max_bytes
+    once the cache exceeds it. The cache size is scanned once and then
+    tracked per write, so the directory is only walked again on eviction.
+    """
+
+    def __init__(self, directory=os.path.join('results', 'cache'), max_bytes=1 << 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._sources = {}
+        self._size = None  # Bytes in the cache, scanned on the first write
+
+    def _source_hash(self, fn):
+        package = getattr(inspect.getmodule(fn), '__package__', None)
+        if package:
+            root = os.path.dirname(inspect.getsourcefile(importlib.import_module(package.split('.')[0])))
+        else:
+            root = inspect.getsourcefile(fn)
+        if root not in self._sources:
+            if package:
+                files = sorted(os.path.join(directory, name)
+                               for directory, _, names in os.walk(root)
+                               for name in names if name.endswith('.py'))
+            else:
+                files = [root]
+            digest = hashlib.sha256()
+            for path in files:
+                digest.update(os.path.relpath(path, os.path.dirname(root)).encode())
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+            self._sources[root] = digest.hexdigest()
+        return self._sources[root]
+
+    def key(self, fn, params, seed):
+        digest = hashlib.sha256()
+        digest.update(f'v{CACHE_VERSION}'.encode())
+        digest.update(self._source_hash(fn).encode())
+        digest.update(fn.__qualname__.encode())
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+        digest.update(repr(seed).encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f'{key}.pkl')
+
+    def get(self, key):
+        """Returns (True, value) on a hit, (False, None) on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return False, None
+        os.utime(path)  # Mark as recently used
+        return True, value
+
+    def put(self, key, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so readers never see a partial entry
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        if self._size is None:
+            self._size = self._scan_size()
+        if os.path.exists(path):
+            # Overwritten, so its old size no longer counts
+            self._size -= os.path.getsize(path)
+        self._size += os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+        if self._size > self.max_bytes:
+            # Down to 90%, so a full cache is not rescanned on every write
+            self.evict(int(self.max_bytes * 0.9))
+
+    def _scan_size(self):
+        return sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, files in os.walk(self.directory)
+                   for name in files if name.endswith('.pkl'))
+
+    def evict(self, target_bytes=None):
+        """Removes least recently used entries until at most target_bytes (default max_bytes) remain."""
+        if target_bytes is None:
+            target_bytes = self.max_bytes
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.pkl'):
+                    stat = os.stat(os.path.join(root, name))
+                    entries.append((stat.st_mtime, stat.st_size, os.path.join(root, name)))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= target_bytes:
+                break
+            os.remove(path)
+            total -= size
+        self._size = total
+
+    def clear(self):
+        self.evict(0)
@@ -0,0 +1,136 @@
+import csv
+import json
+import os
+import shutil
+
+import numpy as np
+
+
+class ResultsStore:
+    """
+    Append-only columnar store for one experiment's result rows.
+
+    A store is a directory holding schema.json and one raw binary file per
+    column (<name>.bin). Columns have a fixed NumPy dtype and an optional
+    per-row shape, so a whole rank curve or balance history can be one cell.
+    Appending writes to the end of each column file, so a running sweep can
+    add rows as cells finish; readers memory-map the files and get NumPy
+    arrays without parsing or copying.
+    """
+
+    SCHEMA_FILE = 'schema.json'
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, self.SCHEMA_FILE)) as f:
+            schema = json.load(f)
+        self.columns = {name: (np.dtype(spec['dtype']), tuple(spec['shape']))
+                        for name, spec in schema['columns'].items()}
+
+    @classmethod
+    def create(cls, path, columns, overwrite=False):
+        """
+        Creates an empty store. `columns` maps column names to a dtype
+        ('i8', 'f8', ...) or to (dtype, per-row shape). With overwrite=True
+        an existing store at `path` is replaced, as the CSV writers did.
+        """
+        if os.path.exists(path):
+            if not overwrite:
+                raise FileExistsError(f"results store already exists: {path}")
+            shutil.rmtree(path)
+        os.makedirs(path)
+
+        schema = {'columns': {}}
+        for name, spec in columns.items():
+            dtype, shape = spec if isinstance(spec, tuple) else (spec, ())
+            schema['columns'][name] = {'dtype': np.dtype(dtype).str, 'shape': list(shape)}
+            open(os.path.join(path, f'{name}.bin'), 'wb').close()
+
+        with open(os.path.join(path, cls.SCHEMA_FILE), 'w') as f:
+            json.dump(schema, f, indent=2)
+        return cls(path)
+
+    def _column_file(self, name):
+        return os.path.join(self.path, f'{name}.bin')
+
+    def _row_bytes(self, name):
+        dtype, shape = self.columns[name]
+        return dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+
+    def __len__(self):
+        # A column whose append was interrupted is longer; count complete rows only
+        return min(os.path.getsize(self._column_file(name)) // self._row_bytes(name)
+                   for name in self.columns)
+
+    def append(self, rows=None, **columns):
+        """
+        Appends rows, given either as a list of dicts (like csv.DictWriter)
+        or as one array per column via keyword arguments.
+        """
+        if rows is not None:
+            columns = {name: [row[name] for row in rows] for name in self.columns}
+
+        missing = set(self.columns) - set(columns)
+        if missing:
+            raise ValueError(f"missing columns: {sorted(missing)}")
+
+        arrays = {}
+        num_rows = None
+        for name, (dtype, shape) in self.columns.items():
+            array = np.asarray(columns[name], dtype=dtype)
+            array = array.reshape((-1,) + shape)
+            if num_rows is not None and len(array) != num_rows:
+                raise ValueError("all columns must have the same number of rows")
+            num_rows = len(array)
+            arrays[name] = array
+
+        for name, array in arrays.items():
+            with open(self._column_file(name), 'ab') as f:
+                f.write(np.ascontiguousarray(array).tobytes())
+
+    def read(self, columns=None):
+        """
+        Memory-maps the store. Returns {name: read-only array}.
+        """
+        num_rows = len(self)
+        result = {}
+        for name in columns or self.columns:
+            dtype, shape = self.columns[name]
+            if num_rows == 0:
+                result[name] = np.empty((0,) + shape, dtype=dtype)
+            else:
+                result[name] = np.memmap(self._column_file(name), dtype=dtype, mode='r',
+                                         shape=(num_rows,) + shape)
+        return result
+
+    def to_pandas(self, columns=None):
+        """
+        DataFrame over the scalar columns, backed by the memory maps.
+        """
+        import pandas as pd
+
+        names = [name for name in (columns or self.columns) if self.columns[name][1] == ()]
+        return pd.DataFrame(self.read(names), copy=False)
+
+    def export_csv(self, csv_path, columns=None):
+        """
+        Writes the scalar columns as CSV, in the layout of the files in results/.
+        """
+        names = [name for name in (columns or self.columns) if self.columns[name][1] == ()]
+        data = self.read(names)
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(names)
+            writer.writerows(zip(*(data[name].tolist() for name in names)))
+
+
+# Stores live next to the CSV exports
+STORE_ROOT = os.path.join('results', 'store')
+
+
+def new_store(name, columns):
+    """
+    Fresh store for one run of an experiment under results/store/<name>,
+    replacing the previous run's rows.
+    """
+    return ResultsStore.create(os.path.join(STORE_ROOT, name), columns, overwrite=True)
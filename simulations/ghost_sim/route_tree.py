@@ -0,0 +1,178 @@
+import numpy as np
+
+
+class RouteTree:
+    """
+    A burst route tree stored as flat arrays in breadth-first order.
+
+    Node i carries the recipient ids[i], sits at hop depth[i] and hangs off
+    node parent[i] (-1 for the root). Children of a node are stored
+    contiguously, so parent is non-decreasing and a node's children are found
+    with a binary search instead of per-node child lists.
+    """
+
+    def __init__(self, ids, parent, depth):
+        self.ids = ids          # recipient ID per node (int32)
+        self.parent = parent    # parent index per node, -1 for the root (int32)
+        self.depth = depth      # hop number per node (uint8)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def id(self):
+        # Recipient of the root, like RNode.id
+        return int(self.ids[0])
+
+    @property
+    def nbytes(self):
+        return self.ids.nbytes + self.parent.nbytes + self.depth.nbytes
+
+    def children(self, index):
+        """Indices of the direct children of node `index`."""
+        start = np.searchsorted(self.parent, index, side='left')
+        end = np.searchsorted(self.parent, index, side='right')
+        return np.arange(start, end)
+
+    def level(self, hop):
+        """Recipient IDs of all nodes on the given hop."""
+        start = np.searchsorted(self.depth, hop, side='left')
+        end = np.searchsorted(self.depth, hop, side='right')
+        return self.ids[start:end]
+
+    def preorder(self):
+        """
+        Yields (recipient ID, hop) in the depth-first order the recursive
+        getHops visited nodes, using an explicit stack.
+        """
+        stack = [0]
+        while stack:
+            index = stack.pop()
+            yield int(self.ids[index]), int(self.depth[index])
+            stack.extend(self.children(index)[::-1].tolist())
+
+
+def generate_route_tree(first_hop, last_hop, max_branching, pick_recipients, rng,
+                        real_recipient=None, real_hop=None, recipients_freq=None):
+    """
+    Builds a burst tree level by level without recursion.
+
+    Every node draws randint(1, max_branching) children, as getHops did, and
+    the children of a whole level are laid out with a single np.repeat.
+    pick_recipients(n) returns n fake recipient IDs for one level. Nodes on
+    real_hop carry real_recipient (the recursive generator marked every node
+    of that hop, since addedReal was only passed down, never sideways).
+    If recipients_freq is given, it is updated once per level.
+    """
+    ids_levels = []
+    parent_levels = []
+    depth_levels = []
+
+    parents = np.array([-1], dtype=np.int32)
+    offset = 0
+
+    for hop in range(first_hop, last_hop + 1):
+        count = len(parents)
+        if real_recipient is not None and hop == real_hop:
+            level_ids = np.full(count, real_recipient, dtype=np.int32)
+        else:
+            level_ids = np.asarray(pick_recipients(count), dtype=np.int32)
+
+        if recipients_freq is not None:
+            recipients_freq.update(level_ids.tolist())
+
+        ids_levels.append(level_ids)
+        parent_levels.append(parents)
+        depth_levels.append(np.full(count, hop, dtype=np.uint8))
+
+        if hop == last_hop:
+            break
+
+        # Vectorized branching for the whole level
+        branching = rng.integers(1, max_branching + 1, size=count)
+        parents = np.repeat(np.arange(offset, offset + count, dtype=np.int32), branching)
+        offset += count
+
+    if not ids_levels:
+        return None
+
+    return RouteTree(np.concatenate(ids_levels),
+                     np.concatenate(parent_levels),
+                     np.concatenate(depth_levels))
+
+
+def complete_tree_chunks(H, B, chunk_size, levels='all'):
+    """
+    Yields (depth, parent) arrays for the complete B-ary burst tree of H hops,
+    in breadth-first order and at most chunk_size nodes at a time.
+
+    Nodes are numbered as in RouteTree, minus the sender: hop d holds B**d
+    nodes and the first hop's parent is -1. Parents are computed from node
+    positions, so memory stays O(chunk_size) however large B**H is. Chunks
+    never span two hops. levels='last' yields hop H only, i.e. the B**H
+    packets of the simplified burst model.
+    """
+    if levels not in ('all', 'last'):
+        raise ValueError(f"levels must be 'all' or 'last', not {levels!r}")
+
+    offset = 0  # Index of the first node on the current hop
+    parent_offset = -1
+    for hop in range(1, H + 1):
+        count = B ** hop
+        if levels == 'all' or hop == H:
+            for start in range(0, count, chunk_size):
+                stop = min(count, start + chunk_size)
+                depth = np.full(stop - start, hop, dtype=np.uint8)
+                if hop == 1:
+                    parent = np.full(stop - start, -1, dtype=np.int64)
+                else:
+                    parent = parent_offset + np.arange(start, stop, dtype=np.int64) // B
+                yield depth, parent
+        parent_offset = offset
+        offset += count
+
+
+def random_forest(num_trees, min_hops, max_hops, max_branching, rng):
+    """
+    Shapes of num_trees random burst trees, grown level by level for all
+    trees at once.
+
+    As in getPackageRouteNew / getHops, each tree draws its hop count from
+    randint(min_hops, max_hops) and has a root on hop 0; every node above
+    the tree's last hop draws randint(1, max_branching) children. Nodes are
+    laid out breadth-first across the forest in the RouteTree layout
+    (children contiguous, parent non-decreasing, -1 for each root), and
+    within a hop they are ordered by tree. Returns (depth, parent, tree,
+    hops): per node its hop, parent index and tree index, and per tree its
+    hop count.
+    """
+    hops = rng.integers(min_hops, max_hops + 1, size=num_trees)
+
+    depth_levels = []
+    parent_levels = []
+    tree_levels = []
+
+    # int32 indices, as in RouteTree: a forest of 2**31 nodes would not fit in memory anyway
+    parents = np.full(num_trees, -1, dtype=np.int32)
+    trees = np.arange(num_trees, dtype=np.int32)
+    remaining = hops.astype(np.uint8)  # Per node: hops left below it in its tree
+    offset = 0
+
+    for hop in range(max_hops + 1):
+        count = len(parents)
+        depth_levels.append(np.full(count, hop, dtype=np.uint8))
+        parent_levels.append(parents)
+        tree_levels.append(trees)
+
+        # Trees that reached their last hop stop branching
+        branching = rng.integers(1, max_branching + 1, size=count, dtype=np.uint8)
+        branching[remaining == 0] = 0
+        parents = np.repeat(np.arange(offset, offset + count, dtype=np.int32), branching)
+        trees = np.repeat(trees, branching)
+        remaining = np.repeat(remaining - 1, branching)
+        offset += count
+        if len(parents) == 0:
+            break
+
+    return (np.concatenate(depth_levels), np.concatenate(parent_levels),
+            np.concatenate(tree_levels), hops)
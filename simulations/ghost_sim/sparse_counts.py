@@ -0,0 +1,118 @@
+import numpy as np
+
+
+class SparseCounts:
+    """
+    Sparse num_rows x num_cols count matrix built from bulk (row, col) events.
+
+    Cell (r, c) is stored under the int64 key r * num_cols + c. Added events
+    are reduced per call with np.unique and staged; once the staged entries
+    outnumber the stored ones they are sorted and merged in, so the stored
+    arrays are rewritten O(log events) times overall. Stored keys stay sorted,
+    which makes them row-major COO, and CSR only needs the row pointers.
+    Memory is 12 bytes per non-zero cell (int64 key, int32 count); pass a
+    float dtype to accumulate weights instead of counts.
+    """
+
+    def __init__(self, num_rows, num_cols, dtype=np.int32):
+        self.shape = (num_rows, num_cols)
+        self.keys = np.zeros(0, dtype=np.int64)      # Sorted, unique
+        self.counts = np.zeros(0, dtype=dtype)
+        self._staged_keys = []
+        self._staged_counts = []
+        self._staged_size = 0
+
+    def add(self, rows, cols, counts=None):
+        """
+        Adds one event per (rows[i], cols[i]), or counts[i] events (counts
+        broadcasts too). rows broadcasts against cols, so a (n, 1) column of
+        senders against a (n, k) block of recipients adds a whole batch of
+        bursts.
+        """
+        rows, cols = np.broadcast_arrays(np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))
+        keys = (rows * self.shape[1] + cols).ravel()
+        if len(keys) == 0:
+            return
+        if counts is None:
+            keys, counts = np.unique(keys, return_counts=True)
+        else:
+            counts = np.broadcast_to(counts, rows.shape).ravel()
+        self._staged_keys.append(keys)
+        self._staged_counts.append(counts.astype(self.counts.dtype))
+        self._staged_size += len(keys)
+        if self._staged_size >= max(len(self.keys), 1 << 16):
+            self.compact()
+
+    def compact(self):
+        """Merges the staged events into the sorted key/count arrays."""
+        if not self._staged_keys:
+            return
+        keys, counts = self._reduce(np.concatenate(self._staged_keys), np.concatenate(self._staged_counts))
+        self._staged_keys, self._staged_counts, self._staged_size = [], [], 0
+
+        # Cells already stored are incremented in place, new ones inserted,
+        # so the stored arrays are copied once rather than re-sorted
+        pos = np.searchsorted(self.keys, keys)
+        found = pos < len(self.keys)
+        found[found] = self.keys[pos[found]] == keys[found]
+        self.counts[pos[found]] += counts[found]
+        new = ~found
+        self.keys = np.insert(self.keys, pos[new], keys[new])
+        self.counts = np.insert(self.counts, pos[new], counts[new])
+
+    @staticmethod
+    def _reduce(keys, counts):
+        """Sorts keys and sums the counts of equal keys."""
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        return keys[starts], np.add.reduceat(counts[order], starts)
+
+    @property
+    def nnz(self):
+        self.compact()
+        return len(self.keys)
+
+    @property
+    def nbytes(self):
+        return (self.keys.nbytes + self.counts.nbytes
+                + sum(k.nbytes + c.nbytes for k, c in zip(self._staged_keys, self._staged_counts)))
+
+    def coo(self):
+        """(rows, cols, counts) of the non-zero cells, in row-major order."""
+        self.compact()
+        rows, cols = np.divmod(self.keys, self.shape[1])
+        return rows, cols, self.counts
+
+    def csr(self):
+        """(indptr, indices, data) arrays in the layout of scipy.sparse.csr_matrix."""
+        rows, cols, counts = self.coo()
+        indptr = np.zeros(self.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self.shape[0]), out=indptr[1:])
+        return indptr, cols, counts
+
+    def get(self, rows, cols):
+        """Values of cells (rows[i], cols[i]), zero where nothing was added."""
+        self.compact()
+        keys = np.asarray(rows, dtype=np.int64) * self.shape[1] + np.asarray(cols, dtype=np.int64)
+        if len(self.keys) == 0:
+            return np.zeros(keys.shape, dtype=self.counts.dtype)
+        pos = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        return np.where(self.keys[pos] == keys, self.counts[pos], 0).astype(self.counts.dtype)
+
+    def row(self, r):
+        """(cols, counts) of row r."""
+        self.compact()
+        start, end = np.searchsorted(self.keys, [r * self.shape[1], (r + 1) * self.shape[1]])
+        return self.keys[start:end] - r * self.shape[1], self.counts[start:end]
+
+    def to_scipy(self):
+        """
+        The matrix as a scipy.sparse.csr_matrix. SciPy is only needed here.
+        """
+        try:
+            from scipy.sparse import csr_matrix
+        except ImportError as e:
+            raise ImportError("to_scipy() requires SciPy; use csr() or coo() for the raw arrays") from e
+        indptr, indices, data = self.csr()
+        return csr_matrix((data, indices, indptr), shape=self.shape)
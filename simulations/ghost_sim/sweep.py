@@ -0,0 +1,99 @@
+import functools
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .instrumentation import run_instrumented
+
+
+def task_seed(master_seed, config, trial):
+    """
+    Independent SeedSequence for one (config, trial) task.
+
+    The stream is keyed on the config's values rather than its position in
+    the grid, so adding a value to H_values or reordering configs does not
+    change the numbers produced for the cells that were already there.
+    """
+    key = json.dumps(config, sort_keys=True).encode()
+    words = np.frombuffer(hashlib.sha256(key).digest()[:16], dtype=np.uint32)
+    return np.random.SeedSequence(master_seed, spawn_key=(*words.tolist(), trial))
+
+
+def _run_task(args):
+    task_fn, config, trial, seed = args
+    return task_fn(config, trial, np.random.default_rng(seed))
+
+
+def _run_instrumented_task(args, trace_memory=False):
+    return run_instrumented(_run_task, args, trace_memory=trace_memory)
+
+
+def run_sweep(task_fn, configs, num_trials, master_seed=0, workers=None, chunksize=1, cache=None,
+              metrics=None, first_trial=0):
+    """
+    Runs task_fn(config, trial, rng) for every config and for trials
+    first_trial .. first_trial + num_trials - 1. num_trials and first_trial
+    may also be lists with one entry per config.
+
+    Tasks are spread over a process pool of `workers` processes (default: all
+    cores; 1 runs in-process). Each task gets its own Generator derived from
+    master_seed, so results are bit-identical whatever the worker count.
+    task_fn must be a module-level function so it can be pickled.
+    With a ResultCache, tasks already computed for the same function,
+    config, trial and seed are loaded instead of run.
+    With an Instrumentation, each task runs with a fresh one active in its
+    worker (see instrumentation.current()) and the snapshots are merged into
+    `metrics`; cache hits are counted as 'cache_hits'. Tasks trace their
+    peak Python allocations if metrics.trace_memory is set.
+    Returns a list with, per config, the list of its trial results in order.
+    """
+    counts = list(num_trials) if isinstance(num_trials, (list, tuple)) else [num_trials] * len(configs)
+    firsts = list(first_trial) if isinstance(first_trial, (list, tuple)) else [first_trial] * len(configs)
+    tasks = [(task_fn, config, trial, task_seed(master_seed, config, trial))
+             for config, count, first in zip(configs, counts, firsts)
+             for trial in range(first, first + count)]
+
+    flat = [None] * len(tasks)
+    pending = list(range(len(tasks)))
+    keys = {}
+    if cache is not None:
+        pending = []
+        for i, (_, config, trial, _) in enumerate(tasks):
+            keys[i] = cache.key(task_fn, {'config': config, 'trial': trial}, master_seed)
+            hit, value = cache.get(keys[i])
+            if hit:
+                flat[i] = value
+            else:
+                pending.append(i)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if metrics is None:
+        run = _run_task
+    else:
+        run = functools.partial(_run_instrumented_task, trace_memory=metrics.trace_memory)
+    if workers <= 1 or len(pending) <= 1:
+        computed = [run(tasks[i]) for i in pending]
+    else:
+        # Imported here: multiprocessing is slow to import and only pools need it
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            computed = list(pool.map(run, [tasks[i] for i in pending], chunksize=chunksize))
+
+    if metrics is not None:
+        metrics.count('tasks', len(pending))
+        metrics.count('cache_hits', len(tasks) - len(pending))
+        for _, snapshot in computed:
+            metrics.merge(snapshot)
+        computed = [value for value, _ in computed]
+
+    for i, value in zip(pending, computed):
+        flat[i] = value
+        if cache is not None:
+            cache.put(keys[i], value)
+
+    ends = np.cumsum(counts, dtype=np.int64).tolist()
+    return [flat[end - count:end] for count, end in zip(counts, ends)]
@@ -0,0 +1,149 @@
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from .entropy_attack import GhostProtocolFast
+from .results_store import new_store
+from .sparse_counts import SparseCounts
+
+# --- Multi-Sender Traffic ---
+
+# One round of traffic: who sent (senders), to whom really (recipients, the
+# ground truth the adversary does not see) and the bursts it does see
+Round = namedtuple('Round', ['senders', 'recipients', 'bursts'])
+
+
+class TrafficModel:
+    """
+    Many concurrent senders sharing one GhostProtocolFast, simulated per round.
+
+    Sender s (IDs 0..num_senders-1) has its own contact list of recipient IDs
+    (1..num_recipients) and sends one message per round with probability
+    send_prob[s], to a uniformly chosen contact. All messages of a round
+    become bursts in one generate_bursts_batch call (chunked to at most
+    max_batch_packets), and the protocol history is updated once afterwards,
+    so every sender in a round sees the same history.
+
+    The adversary sees which sender emitted each burst and where its packets
+    went. Those sender x recipient counts accumulate in `observations`, a
+    SparseCounts updated in bulk once per round; observe=False skips it.
+
+    By default a sender has 1 + Poisson(mean_contacts - 1) random contacts
+    and an exponentially distributed send probability with mean
+    mean_send_prob; pass contacts (one ID array per sender) or send_prob to
+    set them. Contacts are stored CSR-style in contact_ptr / contact_ids.
+    """
+
+    def __init__(self, num_senders, num_recipients, rng, H=3, B=2, mean_contacts=10,
+                 mean_send_prob=0.01, contacts=None, send_prob=None, protocol=None,
+                 max_batch_packets=1 << 22, observe=True, metrics=None):
+        self.num_senders = num_senders
+        self.num_recipients = num_recipients
+        self.rng = rng
+        self.H = H
+        self.B = B
+        self.metrics = metrics
+        if protocol is None:
+            protocol = GhostProtocolFast(num_recipients, rng=rng, metrics=metrics, dense_history=True)
+        self.protocol = protocol
+        self.max_batch_packets = max_batch_packets
+
+        if contacts is None:
+            num_contacts = 1 + rng.poisson(mean_contacts - 1, size=num_senders)
+            contact_ids = rng.integers(1, num_recipients + 1, size=num_contacts.sum(), dtype=np.int32)
+        else:
+            num_contacts = np.array([len(c) for c in contacts], dtype=np.int64)
+            contact_ids = np.concatenate(contacts).astype(np.int32)
+        if len(num_contacts) != num_senders or np.any(num_contacts == 0):
+            raise ValueError("every sender needs at least one contact")
+        self.num_contacts = num_contacts
+        self.contact_ptr = np.concatenate([[0], np.cumsum(num_contacts)])
+        self.contact_ids = contact_ids
+
+        if send_prob is None:
+            send_prob = np.minimum(rng.exponential(mean_send_prob, size=num_senders), 1)
+        self.send_prob = np.broadcast_to(np.asarray(send_prob, dtype=np.float32), (num_senders,))
+
+        # Recipient 0 is never used, so cell (s, r) is column r as-is
+        self.observations = SparseCounts(num_senders, num_recipients + 1) if observe else None
+        self.rounds = 0
+        self.messages = 0
+        self._draw = np.empty(num_senders, dtype=np.float32)
+
+    def contacts_of(self, sender):
+        return self.contact_ids[self.contact_ptr[sender]:self.contact_ptr[sender + 1]]
+
+    def step(self):
+        """
+        Simulates one round. Returns it as a Round; bursts has one row of
+        B**H packets per sender in senders.
+        """
+        metrics = self.metrics
+        self.rng.random(dtype=np.float32, out=self._draw)
+        senders = np.flatnonzero(self._draw < self.send_prob)
+        picks = (self.rng.random(len(senders)) * self.num_contacts[senders]).astype(np.int64)
+        real = self.contact_ids[self.contact_ptr[senders] + picks]
+
+        total_packets = self.B ** self.H
+        bursts = np.empty((len(senders), total_packets), dtype=np.int32)
+        chunk = max(1, self.max_batch_packets // total_packets)
+        for start in range(0, len(senders), chunk):
+            end = min(start + chunk, len(senders))
+            self.protocol.generate_bursts_batch(real[start:end], self.H, self.B, end - start,
+                                                out=bursts[start:end])
+
+        if metrics is not None:
+            t0 = time.perf_counter()
+        if self.observations is not None and len(senders):
+            self.observations.add(senders[:, None], bursts)
+        if metrics is not None:
+            metrics.add_time('observations', time.perf_counter() - t0)
+            metrics.count('rounds')
+            metrics.count('messages', len(senders))
+
+        self.protocol.update_history(bursts.ravel())
+        self.rounds += 1
+        self.messages += len(senders)
+        return Round(senders, real, bursts)
+
+    def run(self, num_rounds):
+        """Simulates num_rounds rounds, keeping only the accumulated state."""
+        for _ in range(num_rounds):
+            self.step()
+
+
+# --- Experiment ---
+
+def run_traffic_experiment(num_senders=10**5, num_recipients=10**6, num_rounds=1000, seed=0,
+                           H=3, B=2, report_every=100, metrics=None):
+    print(f"\nStarting Experiment F: Global Traffic ({num_senders} senders, "
+          f"{num_recipients} recipients, {num_rounds} rounds)...")
+
+    traffic = TrafficModel(num_senders, num_recipients, np.random.default_rng(seed), H=H, B=B,
+                           metrics=metrics)
+    observations = traffic.observations
+
+    store = new_store('traffic', {'Round': 'i8', 'Messages': 'i8', 'Packets': 'i8',
+                                  'ObservedCells': 'i8', 'MatrixMiB': 'f8', 'Seconds': 'f8'})
+    start = time.perf_counter()
+    for round_index in range(1, num_rounds + 1):
+        traffic.step()
+        if round_index % report_every == 0 or round_index == num_rounds:
+            # nnz merges the staged rounds, so it is only read when reporting
+            seconds = time.perf_counter() - start
+            store.append(Round=round_index, Messages=traffic.messages,
+                         Packets=traffic.protocol.total_packets_seen, ObservedCells=observations.nnz,
+                         MatrixMiB=observations.nbytes / 2**20, Seconds=seconds)
+            print(f"Round {round_index}: {traffic.messages} messages, {observations.nnz} observed "
+                  f"sender-recipient pairs ({observations.nbytes / 2**20:.1f} MiB), {seconds:.1f}s")
+
+    if metrics is not None:
+        metrics.gauge_max('observed_cells', observations.nnz)
+    store.export_csv('results/results_traffic.csv')
+    print("Experiment F Complete.")
+    return traffic
+
+
+if __name__ == "__main__":
+    run_traffic_experiment()